@@ -0,0 +1,185 @@
+from typing import NamedTuple
+
+import numpy as np
+
+import database
+
+# Columnar, vectorized analysis of a user's workout history.
+# WorkoutHistory loads exercise_logs once into NumPy arrays (dates as
+# datetime64, exercise names as integer category codes) so rolling averages,
+# training volume, estimated 1RM trends and period comparisons run as array
+# operations instead of Python loops over row tuples.
+
+class PeriodComparison(NamedTuple):
+    period_start: np.datetime64
+    current_total: float
+    previous_total: float
+    change_pct: float # NaN when the previous period is empty
+
+AGGREGATIONS = ("sum", "mean", "max")
+
+def period_index(days, period):
+    """Maps datetime64[D] values to integer period numbers and back to the period start."""
+    if period == "D":
+        return days.astype(np.int64), lambda index: index.astype("datetime64[D]")
+    if period == "W":
+        # 1970-01-01 was a Thursday; shift by 3 days so weeks start on Monday
+        return (days.astype(np.int64) + 3) // 7, lambda index: (index * 7 - 3).astype("datetime64[D]")
+    if period == "M":
+        return days.astype("datetime64[M]").astype(np.int64), lambda index: index.astype("datetime64[M]").astype("datetime64[D]")
+    raise ValueError(f"Unknown period '{period}'. Use 'D', 'W' or 'M'.")
+
+def aggregate_by_period(days, values, period="W", how="sum"):
+    """Aggregates values per day ('D'), week ('W') or month ('M'); days must be sorted
+    datetime64[D]. Missing values (NaN) count as 0 in a sum and are left out of a
+    mean or max. Returns (period_starts, values) for periods that have data.
+    """
+    if how not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation '{how}'. Use 'sum', 'mean' or 'max'.")
+    if how == "max":
+        keep = ~np.isnan(values)
+        values, days = values[keep], days[keep]
+    if not len(values):
+        return np.array([], dtype="datetime64[D]"), np.array([], dtype=float)
+
+    index, to_start = period_index(days, period)
+    periods, starts = np.unique(index, return_index=True) # index is sorted because dates are
+    if how == "sum":
+        result = np.add.reduceat(np.nan_to_num(values), starts)
+    elif how == "mean":
+        # Missing values (e.g. weight of bodyweight sets) are left out of both sum and count
+        counts = np.add.reduceat((~np.isnan(values)).astype(float), starts)
+        totals = np.add.reduceat(np.nan_to_num(values), starts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = np.where(counts > 0, totals / counts, np.nan)
+    else:
+        result = np.maximum.reduceat(values, starts)
+    return to_start(periods), result
+
+class WorkoutHistory:
+    """A user's exercise logs as NumPy columns, sorted oldest first."""
+    COLUMNS = ("sets", "reps", "weight_kg", "calories", "volume", "estimated_1rm")
+    __slots__ = ("dates", "exercise_codes", "exercise_names", "sets", "reps", "weight_kg", "calories")
+
+    def __init__(self, dates, exercise_codes, exercise_names, sets, reps, weight_kg, calories):
+        self.dates = dates # datetime64[s]
+        self.exercise_codes = exercise_codes # int index into exercise_names
+        self.exercise_names = exercise_names # sorted unique names (the categories)
+        self.sets = sets
+        self.reps = reps
+        self.weight_kg = weight_kg # NaN where no weight was logged
+        self.calories = calories
+
+    @classmethod
+    def load(cls, user_id, start_date=None, end_date=None, exercise_name=None):
+        """Reads the user's logs in a single query and converts them to columns."""
+        where, params = database.log_filter_clause(user_id, start_date, end_date, exercise_name)
+        conn = database.connect_db()
+        # SQLite converts log_date to epoch seconds, so no per-row parsing happens in Python
+        rows = conn.execute(
+            f"SELECT CAST(strftime('%s', log_date) AS INTEGER), exercise_name, sets, reps, weight_kg, calories "
+            f"FROM exercise_logs WHERE {where} ORDER BY log_date ASC, id ASC",
+            params
+        ).fetchall()
+        if not rows:
+            return cls(np.array([], dtype="datetime64[s]"), np.array([], dtype=np.int64), np.array([], dtype=str),
+                       np.array([], dtype=np.int64), np.array([], dtype=np.int64), np.array([], dtype=float), np.array([], dtype=np.int64))
+        epochs, names, sets, reps, weights, calories = zip(*rows)
+        exercise_names, exercise_codes = np.unique(np.array(names), return_inverse=True)
+        return cls(
+            np.array(epochs, dtype=np.int64).astype("datetime64[s]"),
+            exercise_codes,
+            exercise_names,
+            np.array(sets, dtype=np.int64),
+            np.array(reps, dtype=np.int64),
+            np.array(weights, dtype=float), # None becomes NaN
+            np.array(calories, dtype=np.int64),
+        )
+
+    def __len__(self):
+        return len(self.dates)
+
+    def to_dataframe(self):
+        """Returns the history as a pandas DataFrame (requires pandas)."""
+        try:
+            import pandas as pd
+        except ImportError:
+            raise ImportError("pandas is required for WorkoutHistory.to_dataframe(); install it with 'pip install pandas'.")
+        return pd.DataFrame({
+            "log_date": self.dates,
+            "exercise_name": pd.Categorical.from_codes(self.exercise_codes, categories=list(self.exercise_names)),
+            "sets": self.sets,
+            "reps": self.reps,
+            "weight_kg": self.weight_kg,
+            "calories": self.calories,
+        })
+
+    def exercise_mask(self, exercise_name):
+        """Boolean mask selecting one exercise (all False if it was never logged)."""
+        position = np.searchsorted(self.exercise_names, exercise_name)
+        if position >= len(self.exercise_names) or self.exercise_names[position] != exercise_name:
+            return np.zeros(len(self), dtype=bool)
+        return self.exercise_codes == position
+
+    def volume(self):
+        """Training volume per log: sets x reps x weight (0 for unweighted logs)."""
+        return self.sets * self.reps * np.nan_to_num(self.weight_kg)
+
+    def estimated_1rm(self):
+        """Epley estimated one-rep max per log; NaN for unweighted logs."""
+        return np.where(self.reps == 1, self.weight_kg, self.weight_kg * (1 + self.reps / 30.0))
+
+    def column(self, name):
+        """Returns one of COLUMNS as a float array."""
+        if name == "volume":
+            return self.volume()
+        if name == "estimated_1rm":
+            return self.estimated_1rm()
+        if name not in self.COLUMNS:
+            raise ValueError(f"Unknown column '{name}'. Choose one of: {', '.join(self.COLUMNS)}")
+        return getattr(self, name).astype(float)
+
+    def totals_by_period(self, column, period="W", how="sum", mask=None):
+        """Aggregates a column per day ('D'), week ('W') or month ('M').
+        Returns (period_starts, values) for periods that have data.
+        """
+        values = self.column(column)
+        days = self.dates.astype("datetime64[D]")
+        if mask is not None:
+            values, days = values[mask], days[mask]
+        return aggregate_by_period(days, values, period, how)
+
+    def rolling_average(self, column="calories", window_days=7):
+        """Calendar rolling mean of daily totals, counting rest days as zero.
+        Returns (days, values) covering every day from the first to the last log.
+        """
+        if not len(self):
+            return np.array([], dtype="datetime64[D]"), np.array([], dtype=float)
+        days = self.dates.astype("datetime64[D]")
+        offsets = (days - days[0]).astype(np.int64)
+        daily = np.bincount(offsets, weights=np.nan_to_num(self.column(column)))
+        cumulative = np.concatenate(([0.0], np.cumsum(daily)))
+        window = np.minimum(np.arange(1, len(daily) + 1), window_days)
+        # Window sums from the running total; the first days average over fewer days
+        averages = (cumulative[1:] - cumulative[np.arange(1, len(daily) + 1) - window]) / window
+        return days[0] + np.arange(len(daily)), averages
+
+    def e1rm_trend(self, exercise_name, period="W"):
+        """Best estimated 1RM of an exercise per period: (period_starts, values)."""
+        return self.totals_by_period("estimated_1rm", period, how="max", mask=self.exercise_mask(exercise_name))
+
+    def period_over_period(self, column="volume", period="W", reference=None):
+        """Compares the period containing reference (default: the latest log)
+        with the period before it.
+        """
+        if not len(self):
+            return None
+        days = self.dates.astype("datetime64[D]")
+        reference = np.datetime64(reference, "D") if reference is not None else days[-1]
+        index, to_start = period_index(days, period)
+        current, _ = period_index(np.array([reference]), period)
+        values = np.nan_to_num(self.column(column))
+        current_total = float(values[index == current[0]].sum())
+        previous_total = float(values[index == current[0] - 1].sum())
+        change_pct = (current_total - previous_total) / previous_total * 100 if previous_total else float("nan")
+        return PeriodComparison(to_start(current)[0], current_total, previous_total, change_pct)
@@ -0,0 +1,150 @@
+from datetime import date, timedelta
+from typing import NamedTuple, Optional
+
+import database
+
+# Query-level analytics on top of database.py.
+# Every statistic is computed by SQLite (GROUP BY, window functions or the
+# rollup tables) so only summary rows cross into Python. The results are
+# typed records shared by DataAnalysisFrame and ProgressTrackingFrame.
+
+class WorkoutSummary(NamedTuple):
+    total_workouts: int
+    total_sets: int
+    total_reps: int
+    total_calories: int
+    avg_sets: float
+    avg_reps: float
+    first_log_date: str
+    last_log_date: str
+
+class ExerciseFrequency(NamedTuple):
+    exercise_name: str
+    workout_count: int
+    total_calories: int
+
+class PersonalRecord(NamedTuple):
+    exercise_name: str
+    weight_kg: float
+    reps: int
+    log_date: str
+
+class PeriodVolume(NamedTuple):
+    period_start: str # 'YYYY-MM-DD' of the first day in the bucket
+    workout_count: int
+    total_sets: int
+    total_reps: int
+    volume_kg: float # sum of sets * reps * weight_kg over weighted logs
+    total_calories: int
+    max_weight_kg: Optional[float]
+
+class Streak(NamedTuple):
+    start_date: str
+    end_date: str
+    length_days: int
+
+# SQL expressions mapping log_date to the first day of its bucket
+PERIODS = {
+    "day": "date(log_date)",
+    "week": "date(log_date, 'weekday 0', '-6 days')", # Weeks start on Monday
+    "month": "strftime('%Y-%m-01', log_date)",
+}
+
+def workout_summary(user_id):
+    """Totals and averages for a user, read from the user_rollups table."""
+    user_totals, _ = database.get_rollup_summary(user_id)
+    if not user_totals:
+        return None
+    total_workouts, total_sets, total_reps, total_calories, first_log_date, last_log_date = user_totals
+    return WorkoutSummary(
+        total_workouts, total_sets, total_reps, total_calories,
+        total_sets / total_workouts, total_reps / total_workouts,
+        first_log_date, last_log_date,
+    )
+
+def top_exercises(user_id, limit=5):
+    """Most frequently logged exercises. Reads exercise_rollups, the
+    materialized GROUP BY user_id, exercise_name over exercise_logs.
+    """
+    conn = database.connect_db()
+    rows = conn.execute(
+        "SELECT exercise_name, workout_count, total_calories FROM exercise_rollups "
+        "WHERE user_id = ? ORDER BY workout_count DESC, exercise_name ASC LIMIT ?",
+        (user_id, limit)
+    ).fetchall()
+    return [ExerciseFrequency(*row) for row in rows]
+
+def personal_records(user_id):
+    """Heaviest weighted set per exercise, with the reps and date it was achieved."""
+    conn = database.connect_db()
+    rows = conn.execute('''
+        SELECT exercise_name, weight_kg, reps, log_date FROM (
+            SELECT exercise_name, weight_kg, reps, log_date,
+                   ROW_NUMBER() OVER (PARTITION BY exercise_name ORDER BY weight_kg DESC, log_date ASC) AS rank
+            FROM exercise_logs
+            WHERE user_id = ? AND weight_kg IS NOT NULL
+        )
+        WHERE rank = 1
+        ORDER BY exercise_name
+    ''', (user_id,)).fetchall()
+    return [PersonalRecord(*row) for row in rows]
+
+def volume_by_period(user_id, period="week", start_date=None, end_date=None, exercise_name=None):
+    """Training totals per day, week or month, oldest bucket first."""
+    if period not in PERIODS:
+        raise ValueError(f"Unknown period '{period}'. Choose one of: {', '.join(PERIODS)}")
+    where, params = database.log_filter_clause(user_id, start_date, end_date, exercise_name)
+    conn = database.connect_db()
+    rows = conn.execute(f'''
+        SELECT {PERIODS[period]} AS period_start,
+               COUNT(*), SUM(sets), SUM(reps),
+               TOTAL(sets * reps * weight_kg), SUM(calories), MAX(weight_kg)
+        FROM exercise_logs
+        WHERE {where}
+        GROUP BY period_start
+        ORDER BY period_start
+    ''', params).fetchall()
+    return [PeriodVolume(*row) for row in rows]
+
+def workout_streaks(user_id, limit=None):
+    """Runs of consecutive days with at least one workout, longest first."""
+    conn = database.connect_db()
+    # Gaps-and-islands: consecutive days share the same (julianday - row_number)
+    sql = '''
+        WITH days AS (
+            SELECT DISTINCT date(log_date) AS day FROM exercise_logs WHERE user_id = ?
+        ),
+        islands AS (
+            SELECT day, julianday(day) - ROW_NUMBER() OVER (ORDER BY day) AS island FROM days
+        )
+        SELECT MIN(day), MAX(day), COUNT(*) AS length_days
+        FROM islands
+        GROUP BY island
+        ORDER BY length_days DESC, MAX(day) DESC
+    '''
+    params = [user_id]
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(limit)
+    return [Streak(*row) for row in conn.execute(sql, params).fetchall()]
+
+def current_streak(user_id, today=None):
+    """The streak that includes today (or yesterday, if nothing is logged yet today), or None."""
+    today = today or date.today()
+    conn = database.connect_db()
+    row = conn.execute('''
+        WITH days AS (
+            SELECT DISTINCT date(log_date) AS day FROM exercise_logs WHERE user_id = ? AND log_date < ?
+        ),
+        islands AS (
+            SELECT day, julianday(day) - ROW_NUMBER() OVER (ORDER BY day) AS island FROM days
+        )
+        SELECT MIN(day), MAX(day), COUNT(*)
+        FROM islands
+        GROUP BY island
+        ORDER BY MAX(day) DESC
+        LIMIT 1
+    ''', (user_id, (today + timedelta(days=1)).isoformat())).fetchone()
+    if row and row[1] >= (today - timedelta(days=1)).isoformat():
+        return Streak(*row)
+    return None
@@ -0,0 +1,157 @@
+import io
+import os
+import time
+from PIL import Image
+
+import utils
+
+# Central image asset manager.
+# Frames ask for images by path instead of calling Image.open themselves.
+# Files are identified by a hash of their contents, so byte-identical files
+# (e.g. the login and signup backgrounds) share one decoded image. Nothing is
+# read until an asset is first requested, and the decoded pixels of assets used
+# only by frames that have not been shown for IDLE_SECONDS are released; they
+# are decoded again if needed later. PhotoImages are owned by the caches that
+# make them (background renders, GIF frames, thumbnails), which report them.
+
+IDLE_SECONDS = 120.0 # Frames not shown for this long lose their decoded images
+
+def _images(value):
+    """Yields the PIL images in a derived value (an image or a tuple/list of images)."""
+    if isinstance(value, Image.Image):
+        yield value
+    elif isinstance(value, (tuple, list)):
+        for item in value:
+            yield from _images(item)
+
+class Asset:
+    """One distinct image file and everything derived from it."""
+    __slots__ = ("digest", "paths", "owners", "image", "derived", "decodes", "file_size")
+
+    def __init__(self, digest, file_size):
+        self.digest = digest
+        self.paths = set() # Every path whose contents hash to digest
+        self.owners = set() # Names of the frames that have used the asset
+        self.image = None # Decoded PIL image, or None until needed / after eviction
+        self.derived = {} # key -> images built from the decoded image (e.g. pre-downscaled copies)
+        self.decodes = 0
+        self.file_size = file_size
+
+class AssetManager:
+    """Loads, deduplicates and caches the application's images."""
+    def __init__(self, idle_seconds=IDLE_SECONDS):
+        self.idle_seconds = idle_seconds
+        self._assets = {} # digest -> Asset
+        self._digests = {} # path -> (mtime_ns, size, digest)
+        self._last_shown = {} # owner -> time.monotonic() when its frame was last shown
+        self.evictions = 0
+
+    def digest(self, path):
+        """Returns the content hash of a file, recomputed only when the file changes.
+        Raises FileNotFoundError if the file does not exist.
+        """
+        stat = os.stat(path)
+        cached = self._digests.get(path)
+        if cached is None or cached[:2] != (stat.st_mtime_ns, stat.st_size):
+            cached = (stat.st_mtime_ns, stat.st_size, utils.file_digest(path))
+            self._digests[path] = cached
+        return cached[2]
+
+    def _asset(self, path, owner):
+        digest = self.digest(path)
+        asset = self._assets.get(digest)
+        if asset is None:
+            asset = self._assets[digest] = Asset(digest, self._digests[path][1])
+        asset.paths.add(path)
+        if owner is not None:
+            asset.owners.add(owner)
+            self._last_shown.setdefault(owner, time.monotonic())
+        return asset
+
+    def image(self, path, owner=None):
+        """Returns the decoded PIL image for path, decoding the file on first use.
+        The image is shared: callers must not modify it in place. Animated images
+        stay open on an in-memory copy of the file so their frames can be seeked.
+        """
+        asset = self._asset(path, owner)
+        if asset.image is None:
+            asset.image = self._decode(path)
+            asset.decodes += 1
+        return asset.image
+
+    def _decode(self, path, draft_size=None):
+        with open(path, "rb") as file:
+            image = Image.open(io.BytesIO(file.read()))
+        if draft_size is not None:
+            image.draft("RGB", draft_size) # JPEGs decode directly at a reduced scale when possible
+        if not getattr(image, "is_animated", False):
+            image.load()
+        return image
+
+    def derived(self, path, key, build, owner=None, draft_size=None):
+        """Returns build(image) for the asset, computed once per key and released
+        together with the decoded image when the asset is evicted.
+        With draft_size, build only needs an image at least that large: unless the
+        full image is already decoded, a reduced-scale decode is made just for build.
+        """
+        asset = self._asset(path, owner)
+        if key not in asset.derived:
+            if draft_size is not None and asset.image is None:
+                image = self._decode(path, draft_size)
+                asset.decodes += 1
+            else:
+                image = self.image(path, owner)
+            asset.derived[key] = build(image)
+        return asset.derived[key]
+
+    def touch(self, owner):
+        """Records that a frame was just shown."""
+        self._last_shown[owner] = time.monotonic()
+
+    def evict_idle(self, idle_seconds=None):
+        """Releases the decoded (and derived) images of assets whose frames have all
+        been idle. Returns the number of assets released.
+        """
+        idle_seconds = self.idle_seconds if idle_seconds is None else idle_seconds
+        now = time.monotonic()
+        released = 0
+        for asset in self._assets.values():
+            if (asset.image is None and not asset.derived) or not asset.owners:
+                continue
+            if all(now - self._last_shown.get(owner, 0) >= idle_seconds for owner in asset.owners):
+                if asset.image is not None:
+                    asset.image.close()
+                asset.image = None
+                asset.derived = {}
+                released += 1
+        self.evictions += released
+        return released
+
+    def cached_images(self):
+        """Returns the decoded and derived images currently held."""
+        return [image for asset in self._assets.values() for image in _asset_images(asset)]
+
+    def memory_bytes(self):
+        """Returns the estimated memory of the decoded and derived images, in bytes."""
+        return sum(_image_bytes(image) for image in self.cached_images())
+
+    def memory_report(self):
+        """Returns one dict per asset with its paths, owners and estimated memory use in bytes."""
+        report = []
+        for asset in self._assets.values():
+            report.append({
+                "digest": asset.digest[:12],
+                "paths": sorted(asset.paths),
+                "owners": sorted(asset.owners),
+                "file_bytes": asset.file_size,
+                "decoded_bytes": sum(_image_bytes(image) for image in _asset_images(asset)),
+                "decodes": asset.decodes,
+            })
+        return report
+
+def _asset_images(asset):
+    images = [asset.image] if asset.image is not None else []
+    return images + [image for value in asset.derived.values() for image in _images(value)]
+
+def _image_bytes(image):
+    return image.width * image.height * len(image.getbands())
@@ -1,10 +1,20 @@
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
 import database
 import utils
 import os
 
+def _authenticate(username, password):
+    """Runs on a database worker: returns (id, username) if the credentials match, else None."""
+    user_data = database.get_user(username)
+    if user_data and utils.check_password(user_data[2], password): # user_data[2] is password_hash
+        return user_data[0], user_data[1]
+    return None
+
+def _register(username, password):
+    """Runs on the database writer: hashes the password and adds the user."""
+    return database.add_user(username, utils.hash_password(password))
+
 class AuthFrame(tk.Frame):
     """Base class for authentication frames, handling common elements like background/side images."""
     def __init__(self, parent, controller, bg_image_path): # Removed side_image_path
@@ -13,19 +23,17 @@ class AuthFrame(tk.Frame):
 
         # Load and set background image
         try:
-            self.bg_image_raw = Image.open(bg_image_path)
-            self.bg_image_tk = None # Will be set on resize
-            self.bg_label = tk.Label(self, image=None)
-            self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-            self.bind("<Configure>", self._resize_background)
+            # Rendered by the shared renderer: debounced, cached per size, previewed while dragging
+            self.background = controller.backgrounds.attach(self, bg_image_path)
+            self.bg_label = self.background.label
         except FileNotFoundError:
             messagebox.showerror("Image Error", f"Background image not found: {bg_image_path}")
             self.config(bg="#f0f0f0") # Fallback background color
-            self.bg_image_raw = None
+            self.background = None
         except Exception as e:
             messagebox.showerror("Image Error", f"Error loading background image: {e}")
             self.config(bg="#f0f0f0")
-            self.bg_image_raw = None
+            self.background = None
 
         # Removed: Load and set side image
         # try:
@@ -47,15 +55,9 @@ class AuthFrame(tk.Frame):
         self.content_frame.place(relx=0.5, rely=0.5, anchor="center", relwidth=0.5, relheight=0.6) # Increased width
 
 
-    def _resize_background(self, event):
-        if self.bg_image_raw:
-            # Resize image to fit window dimensions while maintaining aspect ratio
-            width, height = event.width, event.height
-            if width > 0 and height > 0:
-                resized_image = self.bg_image_raw.resize((width, height), Image.Resampling.LANCZOS)
-                self.bg_image_tk = ImageTk.PhotoImage(resized_image)
-                self.bg_label.config(image=self.bg_image_tk)
-                self.bg_label.image = self.bg_image_tk # Keep a reference!
+    def _set_busy(self, button, busy):
+        """Disables a submit button while its database request is in flight."""
+        button.config(state=tk.DISABLED if busy else tk.NORMAL, cursor="watch" if busy else "hand2")
 
     # Removed: def _resize_side_image(self, event):
     #     if self.side_image_raw:
@@ -89,8 +91,9 @@ class LoginFrame(AuthFrame):
         self.password_entry = tk.Entry(login_frame, show="*", font=("Inter", 12), bd=2, relief="groove")
         self.password_entry.pack(pady=5)
 
-        tk.Button(login_frame, text="Login", font=("Inter", 12, "bold"), bg=controller.config['button_color'], fg="white",
-                  command=self._login, relief="raised", bd=3, cursor="hand2", padx=10, pady=5).pack(pady=10)
+        self.login_button = tk.Button(login_frame, text="Login", font=("Inter", 12, "bold"), bg=controller.config['button_color'], fg="white",
+                                      command=self._login, relief="raised", bd=3, cursor="hand2", padx=10, pady=5)
+        self.login_button.pack(pady=10)
 
         tk.Button(login_frame, text="Don't have an account? Sign Up", font=("Inter", 10), bg=controller.config['content_bg_color'], fg=controller.config['text_color'],
                   command=lambda: self.controller.show_frame("SignupFrame"), relief="flat", cursor="hand2").pack(pady=5)
@@ -103,12 +106,23 @@ class LoginFrame(AuthFrame):
             messagebox.showerror("Login Error", "Please enter both username and password.")
             return
 
-        user_data = database.get_user(username)
-        if user_data and utils.check_password(user_data[2], password): # user_data[2] is password_hash
+        self._set_busy(self.login_button, True)
+        self.controller.db.read(_authenticate, username, password,
+                                on_done=lambda user_data: self._finish_login(username, user_data),
+                                on_error=self._login_failed)
+
+    def _login_failed(self, error):
+        self._set_busy(self.login_button, False)
+        messagebox.showerror("Login Error", f"Could not log in: {error}")
+
+    def _finish_login(self, username, user_data):
+        self._set_busy(self.login_button, False)
+        if user_data:
             self.controller.current_user_id = user_data[0] # Store user ID
             self.controller.current_username = user_data[1] # Store username
             messagebox.showinfo("Login Success", f"Welcome, {username}!")
             self.controller.show_frame("DashboardFrame")
+            self.controller.prewarm.start() # Build the pages the user is likely to open next
             # Clear fields after successful login
             self.username_entry.delete(0, tk.END)
             self.password_entry.delete(0, tk.END)
@@ -135,8 +149,9 @@ class SignupFrame(AuthFrame):
         self.password_entry = tk.Entry(signup_frame, show="*", font=("Inter", 12), bd=2, relief="groove")
         self.password_entry.pack(pady=5)
 
-        tk.Button(signup_frame, text="Sign Up", font=("Inter", 12, "bold"), bg=controller.config['button_color'], fg="white",
-                  command=self._signup, relief="raised", bd=3, cursor="hand2", padx=10, pady=5).pack(pady=10)
+        self.signup_button = tk.Button(signup_frame, text="Sign Up", font=("Inter", 12, "bold"), bg=controller.config['button_color'], fg="white",
+                                       command=self._signup, relief="raised", bd=3, cursor="hand2", padx=10, pady=5)
+        self.signup_button.pack(pady=10)
 
         tk.Button(signup_frame, text="Already have an account? Login", font=("Inter", 10), bg=controller.config['content_bg_color'], fg=controller.config['text_color'],
                   command=lambda: self.controller.show_frame("LoginFrame"), relief="flat", cursor="hand2").pack(pady=5)
@@ -154,7 +169,16 @@ class SignupFrame(AuthFrame):
             messagebox.showerror("Signup Error", "Please enter both username and password.")
             return
 
-        if database.add_user(username, utils.hash_password(password)):
+        self._set_busy(self.signup_button, True)
+        self.controller.db.write(_register, username, password, on_done=self._finish_signup, on_error=self._signup_failed)
+
+    def _signup_failed(self, error):
+        self._set_busy(self.signup_button, False)
+        messagebox.showerror("Signup Error", f"Could not create the account: {error}")
+
+    def _finish_signup(self, created):
+        self._set_busy(self.signup_button, False)
+        if created:
             messagebox.showinfo("Signup Success", "Account created successfully! Please log in.")
             self.controller.show_frame("LoginFrame")
             # Clear fields after successful signup
@@ -0,0 +1,174 @@
+import tkinter as tk
+from collections import OrderedDict
+from PIL import Image, ImageTk
+
+# Shared renderer for full-window background images.
+# Each image is decoded once and pre-downscaled to the screen size; while the
+# window is being resized a cheap preview is shown, and the final LANCZOS render
+# of each size is kept in an LRU. Hidden pages render only when shown again.
+
+PREVIEW_INTERVAL_MS = 40 # Minimum time between preview renders during a drag
+SETTLE_MS = 200 # Quiet time after the last resize before the high-quality pass
+RENDER_CACHE_SIZE = 6 # Final renders kept; each is about width x height x 4 bytes in Tk
+PREVIEW_MAX_SIZE = (640, 480) # Bounding box of the preview source
+PREVIEW_FILTER = Image.Resampling.BILINEAR
+FINAL_FILTER = Image.Resampling.LANCZOS
+
+class BackgroundRenderer:
+    """Loads background images once and renders them at widget sizes, with an LRU of results."""
+    def __init__(self, root, assets, cache_size=RENDER_CACHE_SIZE):
+        self.root = root
+        self.assets = assets
+        self.cache_size = cache_size
+        self._rendered = OrderedDict() # (digest, width, height) -> PhotoImage, least recently used first
+        self._images = [] # Every BackgroundImage created by attach()
+        self.hits = 0
+        self.misses = 0
+        self.previews = 0
+
+    def load(self, path, owner=None):
+        """Returns the (source, preview) pre-downscaled copies of an image.
+        Raises FileNotFoundError (or PIL errors) like Image.open.
+        """
+        max_size = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+        return self.assets.derived(path, ("background", max_size), lambda image: _downscale(image, max_size), owner,
+                                   draft_size=max_size)
+
+    def cached(self, path, width, height):
+        """Returns the final render for this size if it is cached, else None."""
+        key = (self.assets.digest(path), width, height)
+        photo = self._rendered.get(key)
+        if photo is not None:
+            self._rendered.move_to_end(key)
+        return photo
+
+    def render(self, path, width, height, preview=False, owner=None):
+        """Returns a PhotoImage of the image stretched to width x height.
+        Previews are fast, low-quality and never cached.
+        """
+        source, preview_source = self.load(path, owner)
+        if preview:
+            self.previews += 1
+            return ImageTk.PhotoImage(preview_source.resize((width, height), PREVIEW_FILTER))
+
+        photo = self.cached(path, width, height)
+        if photo is not None:
+            self.hits += 1
+            return photo
+        self.misses += 1
+        photo = ImageTk.PhotoImage(source.resize((width, height), FINAL_FILTER))
+        self._rendered[(self.assets.digest(path), width, height)] = photo
+        while len(self._rendered) > self.cache_size:
+            self._rendered.popitem(last=False)
+        return photo
+
+    def attach(self, widget, path):
+        """Creates a label filling widget that shows the image at the widget's size.
+        Returns the BackgroundImage; raises if the image cannot be loaded.
+        """
+        self.load(path, owner=type(widget).__name__)
+        background = BackgroundImage(self, widget, path)
+        self._images.append(background)
+        return background
+
+    def show(self, page):
+        """Called when page is raised: resumes its backgrounds and suspends the others."""
+        self._images = [background for background in self._images if background.widget.winfo_exists()]
+        for background in self._images:
+            if background.widget is page:
+                background.resume()
+            else:
+                background.suspend()
+
+    def cached_images(self):
+        """Returns the final renders held in the LRU."""
+        return list(self._rendered.values())
+
+    def memory_bytes(self):
+        """Returns the Tk memory of the cached renders, in bytes (32-bit pixels)."""
+        return sum(photo.width() * photo.height() * 4 for photo in self._rendered.values())
+
+    def stats(self):
+        """Returns cache counters and the number of previews rendered."""
+        return {"cached": len(self._rendered), "hits": self.hits, "misses": self.misses, "previews": self.previews}
+
+def _downscale(image, max_size):
+    """A background never needs more pixels than the screen has."""
+    source = image.convert("RGB")
+    source.thumbnail(max_size, FINAL_FILTER)
+    preview = source.copy()
+    preview.thumbnail(PREVIEW_MAX_SIZE, FINAL_FILTER)
+    return source, preview
+
+class BackgroundImage:
+    """A label showing a background image, kept in step with its widget's size."""
+    def __init__(self, renderer, widget, path):
+        self.renderer = renderer
+        self.widget = widget
+        self.path = path
+        self.owner = type(widget).__name__
+        self.label = tk.Label(widget, image=None)
+        self.label.place(x=0, y=0, relwidth=1, relheight=1)
+        self.photo = None # The PhotoImage on display; kept referenced so Tk does not drop it
+        self._size = None
+        self._shown_size = None
+        self._final = False # Whether the image on display is the high-quality render
+        self.suspended = True # Until the page is first shown
+        self._preview_id = None
+        self._settle_id = None
+        widget.bind("<Configure>", self._on_configure, add="+")
+
+    def _on_configure(self, event):
+        if event.widget is not self.widget or event.width <= 1 or event.height <= 1:
+            return
+        self._size = (event.width, event.height)
+        if self.suspended or (self._size == self._shown_size and self._final):
+            return # A hidden page renders its latest size when it is shown again
+
+        photo = self.renderer.cached(self.path, *self._size)
+        if photo is not None or self.photo is None:
+            # Already rendered at this size, or nothing is shown yet: render the final image now
+            self._cancel()
+            self._render_final()
+            return
+
+        if self._preview_id is None:
+            self._preview_id = self.widget.after(PREVIEW_INTERVAL_MS, self._render_preview)
+        if self._settle_id is not None:
+            self.widget.after_cancel(self._settle_id)
+        self._settle_id = self.widget.after(SETTLE_MS, self._render_final)
+
+    def _render_preview(self):
+        self._preview_id = None
+        if self._size != self._shown_size:
+            self._show(self.renderer.render(self.path, *self._size, preview=True, owner=self.owner), final=False)
+
+    def _render_final(self):
+        self._settle_id = None
+        if self._size is not None:
+            self._show(self.renderer.render(self.path, *self._size, owner=self.owner), final=True)
+
+    def _show(self, photo, final):
+        self.photo = photo
+        self._shown_size = self._size
+        self._final = final
+        self.label.config(image=photo)
+
+    def suspend(self):
+        """Stops rendering while the page is hidden."""
+        self.suspended = True
+        self._cancel()
+
+    def resume(self):
+        """Renders the size the page was given while it was hidden, once."""
+        if not self.suspended:
+            return
+        self.suspended = False
+        if self._size is not None and (self._size != self._shown_size or not self._final):
+            self._render_final()
+
+    def _cancel(self):
+        for after_id in (self._preview_id, self._settle_id):
+            if after_id is not None:
+                self.widget.after_cancel(after_id)
+        self._preview_id = self._settle_id = None
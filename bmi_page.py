@@ -1,6 +1,5 @@
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk
 import os
 
 class BMICalculatorFrame(tk.Frame):
@@ -14,19 +13,17 @@ class BMICalculatorFrame(tk.Frame):
 
         # Load and set background image
         try:
-            self.bg_image_raw = Image.open(controller.config['bmi_bg_image'])
-            self.bg_image_tk = None # Will be set on resize
-            self.bg_label = tk.Label(self, image=None)
-            self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-            self.bind("<Configure>", self._resize_background)
+            # Rendered by the shared renderer: debounced, cached per size, previewed while dragging
+            self.background = controller.backgrounds.attach(self, controller.config['bmi_bg_image'])
+            self.bg_label = self.background.label
         except FileNotFoundError:
             messagebox.showerror("Image Error", f"Background image not found: {controller.config['bmi_bg_image']}")
             self.config(bg="#f0f0f0") # Fallback background color
-            self.bg_image_raw = None
+            self.background = None
         except Exception as e:
             messagebox.showerror("Image Error", f"Error loading background image: {e}")
             self.config(bg="#f0f0f0")
-            self.bg_image_raw = None
+            self.background = None
 
         # Removed: Load and set side image
         # try:
@@ -66,15 +63,6 @@ class BMICalculatorFrame(tk.Frame):
         tk.Button(content_frame, text="Back to Dashboard", font=("Inter", 12), bg=self.controller.config['button_color'], fg="white",
                   command=lambda: self.controller.show_frame("DashboardFrame"), relief="raised", bd=3, cursor="hand2", padx=10, pady=5).pack(pady=10)
 
-    def _resize_background(self, event):
-        if self.bg_image_raw:
-            width, height = event.width, event.height
-            if width > 0 and height > 0:
-                resized_image = self.bg_image_raw.resize((width, height), Image.Resampling.LANCZOS)
-                self.bg_image_tk = ImageTk.PhotoImage(resized_image)
-                self.bg_label.config(image=self.bg_image_tk)
-                self.bg_label.image = self.bg_image_tk
-
     # Removed: def _resize_side_image(self, event):
     #     if self.side_image_raw:
     #         frame_width = self.side_label.winfo_width()
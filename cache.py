@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import OrderedDict
+
+# Small in-process caches for hot database reads.
+# LRUCache holds a bounded number of entries, drops the least recently used
+# one when full and treats entries older than ttl seconds as missing. It is
+# thread-safe, so pooled connections on worker threads can share it.
+
+_MISSING = object()
+
+class LRUCache:
+    """Bounded, thread-safe LRU cache with an optional time-to-live per entry."""
+    def __init__(self, max_size=128, ttl=None, name="cache"):
+        if max_size <= 0:
+            raise ValueError("max_size must be a positive integer.")
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl # Seconds an entry stays valid; None keeps entries until evicted
+        self._entries = OrderedDict() # key -> (stored_at, value), least recently used first
+        self._lock = threading.Lock()
+        self._generation = 0 # Bumped by every invalidation, see get_or_load
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """Returns the cached value for key, or default if it is missing or expired."""
+        with self._lock:
+            value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def _lookup(self, key):
+        # Caller holds the lock
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return _MISSING
+        stored_at, value = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """Stores a value, evicting the least recently used entries beyond max_size."""
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key, value):
+        # Caller holds the lock
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get_or_load(self, key, loader):
+        """Read-through lookup: returns the cached value or calls loader() and caches its result.
+        A result is not cached if the cache was invalidated while loader() ran, so a
+        read racing with a write never stores the pre-write value.
+        """
+        with self._lock:
+            value = self._lookup(key)
+            generation = self._generation
+        if value is not _MISSING:
+            return value
+        value = loader()
+        with self._lock:
+            if generation == self._generation:
+                self._store(key, value)
+        return value
+
+    def invalidate(self, key):
+        """Removes one entry."""
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def invalidate_where(self, predicate):
+        """Removes every entry whose key satisfies predicate(key)."""
+        with self._lock:
+            self._generation += 1
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        """Removes every entry; the statistics are kept."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self):
+        """Returns hit/miss/eviction counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
@@ -1,11 +1,15 @@
 import tkinter as tk
-from tkinter import messagebox, scrolledtext
+from tkinter import messagebox, ttk
 from datetime import datetime
 from PIL import Image, ImageTk
 import database
+import utils
 import os
 from scrolled_frame import ScrolledFrame # Import the custom ScrolledFrame
 
+LOG_VIEW_PAGE_SIZE = 50 # Log rows fetched per page as the history is scrolled
+LOG_VIEW_PREFETCH_AT = 0.9 # Fetch the next page once the view is scrolled this far down
+
 class CalorieTrackerFrame(tk.Frame):
     """Calorie and Exercise Tracker page frame."""
     def __init__(self, parent, controller):
@@ -55,9 +59,37 @@ class CalorieTrackerFrame(tk.Frame):
 
         # Exercise Log Display
         tk.Label(content_interior, text="My Exercise Log:", font=("Inter", 16, "bold"), bg=self.controller.config['content_bg_color'], fg=self.controller.config['text_color']).pack(pady=10)
-        self.log_display = scrolledtext.ScrolledText(content_interior, width=50, height=10, font=("Inter", 10), bd=2, relief="groove", bg="#e0e0e0") # Increased width
-        self.log_display.pack(pady=5)
-        self.log_display.config(state=tk.DISABLED) # Make it read-only
+        # The history is a Treeview that only holds the pages loaded so far;
+        # further pages are fetched from the database as the user scrolls.
+        log_frame = tk.Frame(content_interior, bg=self.controller.config['content_bg_color'])
+        log_frame.pack(pady=5)
+        columns = {
+            "log_date": ("Date/Time", 140),
+            "exercise_name": ("Exercise", 120),
+            "sets": ("Sets", 45),
+            "reps": ("Reps", 45),
+            "weight": ("Weight", 60),
+            "calories": ("Calories", 65),
+        }
+        self.log_tree = ttk.Treeview(log_frame, columns=tuple(columns), show="headings", height=10, selectmode="browse")
+        for column, (heading, width) in columns.items():
+            self.log_tree.heading(column, text=heading)
+            self.log_tree.column(column, width=width, anchor="w" if column in ("log_date", "exercise_name") else "center")
+        self.log_scrollbar = ttk.Scrollbar(log_frame, orient="vertical", command=self.log_tree.yview)
+        self.log_tree.configure(yscrollcommand=self._on_log_scroll)
+        self.log_tree.pack(side=tk.LEFT)
+        self.log_scrollbar.pack(side=tk.RIGHT, fill='y')
+
+        self.log_status_label = tk.Label(content_interior, text="", font=("Inter", 10), bg=self.controller.config['content_bg_color'], fg=self.controller.config['text_color'])
+        self.log_status_label.pack()
+
+        self._log_cursor = None # Keyset cursor of the next page, None when fully loaded
+        self._log_page_pending = False
+        self._log_request = 0 # Bumped on every reload so pages still in flight for an older one are dropped
+        self._first_page_loading = False
+        self._loaded_key = None # (user_id, data version) of the history being shown; rows use their log id as iid
+        self._pending_changes = [] # DataChange events received since the history was last brought up to date
+        database.add_change_listener(self._on_data_change)
 
         # Back to Dashboard button added
         tk.Button(content_interior, text="Back to Dashboard", font=("Inter", 12), bg=self.controller.config['button_color'], fg="white",
@@ -70,39 +102,29 @@ class CalorieTrackerFrame(tk.Frame):
             self.controller.show_frame("LoginFrame")
             return
 
-        exercise_name = self.exercise_name_entry.get().strip()
-        sets_str = self.sets_entry.get().strip()
-        reps_str = self.reps_entry.get().strip()
-        weight_str = self.weight_entry.get().strip() # Get weight string
-        calories_str = self.calories_entry.get().strip()
         log_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        if not exercise_name:
-            messagebox.showerror("Input Error", "Please enter an exercise name.")
-            return
-
         try:
-            sets = int(sets_str)
-            reps = int(reps_str)
-            calories = int(calories_str)
-            weight_kg = float(weight_str) if weight_str else None # Convert to float, or None if empty
-
-            if sets <= 0 or reps <= 0 or calories <= 0:
-                messagebox.showerror("Input Error", "Sets, Repetitions, and Calories must be positive integers.")
-                return
-            if weight_kg is not None and weight_kg <= 0:
-                messagebox.showerror("Input Error", "Weight must be a positive number or left empty.")
-                return
-
-        except ValueError:
-            messagebox.showerror("Input Error", "Please enter valid numbers for Sets, Repetitions, Weight, and Calories.")
+            exercise_name, sets, reps, weight_kg, calories = utils.validate_exercise_entry(
+                self.exercise_name_entry.get(),
+                self.sets_entry.get(),
+                self.reps_entry.get(),
+                self.weight_entry.get(), # Empty weight means not recorded
+                self.calories_entry.get()
+            )
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
             return
 
         # Pass weight_kg to database function
-        if database.log_exercise(self.controller.current_user_id, exercise_name, sets, reps, weight_kg, calories, log_date):
+        self.controller.db.write(database.log_exercise, self.controller.current_user_id, exercise_name, sets, reps, weight_kg, calories, log_date,
+                                 on_done=self._exercise_logged, error_title="Error")
+
+    def _exercise_logged(self, logged):
+        if logged:
             messagebox.showinfo("Success", "Exercise logged successfully!")
             self._clear_entries()
-            self._load_exercise_logs() # Refresh the log display
+            self._refresh_exercise_logs() # Adds just the new row
         else:
             messagebox.showerror("Error", "Failed to log exercise. Please try again.")
 
@@ -113,31 +135,134 @@ class CalorieTrackerFrame(tk.Frame):
         self.weight_entry.delete(0, tk.END) # Clear weight entry
         self.calories_entry.delete(0, tk.END)
 
+    def _format_log_row(self, log):
+        exercise_name, sets, reps, weight_kg, calories, log_date = log # Unpack weight_kg
+        weight_display = f"{weight_kg:.1f}" if weight_kg is not None else "N/A" # Format weight or show N/A
+        return (log_date, exercise_name, sets, reps, weight_display, calories)
+
+    def _on_data_change(self, change):
+        """Change listener; may run on any thread, so it only queues the event."""
+        # More changes than fit on one page always mean a reload, so later ones are dropped;
+        # the gap they leave in the versions makes _apply_log_changes fall back to it
+        if change.table == "exercise_logs" and len(self._pending_changes) <= LOG_VIEW_PAGE_SIZE:
+            self._pending_changes.append(change)
+
+    def _refresh_exercise_logs(self):
+        """Brings the history up to date: does nothing if the data has not changed,
+        adds newly logged rows at the top when possible, and reloads otherwise.
+        """
+        user_id = self.controller.current_user_id
+        changes, self._pending_changes = self._pending_changes, []
+        if user_id and not self._first_page_loading and self._loaded_key is not None and self._loaded_key[0] == user_id:
+            version = database.get_data_version(user_id, "exercise_logs")
+            if self._loaded_key[1] == version or self._apply_log_changes(changes, user_id, version):
+                return
+        self._load_exercise_logs()
+
+    def _apply_log_changes(self, changes, user_id, version):
+        """Inserts the rows of the changes since the loaded version at the top of the view.
+        Returns False when the changes cannot be applied as a delta and a reload is needed.
+        """
+        changes = [change for change in changes if change.user_id in (user_id, None) and change.version > self._loaded_key[1]]
+        expected = self._loaded_key[1]
+        new_rows = [] # (id, exercise_name, sets, reps, weight_kg, calories, log_date)
+        for change in changes:
+            if change.user_id is None or change.action != "insert" or change.version != expected + 1:
+                return False
+            if len(change.rows) != change.count:
+                return False # A large batch was published without its rows
+            expected = change.version
+            new_rows.extend(change.rows)
+        if expected != version or len(new_rows) > LOG_VIEW_PAGE_SIZE:
+            return False
+
+        # A row committed while the first page was being read may already be shown
+        new_rows = [row for row in new_rows if not self.log_tree.exists(str(row[0]))]
+        # Rows dated before the newest shown row belong further down the history
+        children = self.log_tree.get_children()
+        newest_shown = self.log_tree.item(children[0], "values")[0] if children else ""
+        if any(row[6] < newest_shown for row in new_rows):
+            return False
+        for row in sorted(new_rows, key=lambda row: (row[6], row[0])):
+            self._append_log_row(row[0], row[1:])
+        self._loaded_key = (user_id, version)
+        return True
+
     def _load_exercise_logs(self):
-        """Loads and displays exercise logs for the current user."""
+        """Loads the first page of exercise logs for the current user."""
+        self.log_tree.delete(*self.log_tree.get_children())
+        self._log_cursor = None
+        self._loaded_key = None
+        self._log_request += 1
+        self._first_page_loading = False
+
         if not self.controller.current_user_id:
-            self.log_display.config(state=tk.NORMAL)
-            self.log_display.delete(1.0, tk.END)
-            self.log_display.insert(tk.END, "Please log in to view your exercise history.")
-            self.log_display.config(state=tk.DISABLED)
+            self.log_status_label.config(text="Please log in to view your exercise history.")
+            return
+
+        # Read the version first: a write during the load is applied again by the next
+        # refresh, and skipped there if its row is already in the page
+        self._loaded_key = (self.controller.current_user_id, database.get_data_version(self.controller.current_user_id, "exercise_logs"))
+        self._first_page_loading = True
+        self.log_status_label.config(text="Loading...")
+        self._load_next_log_page(first_page=True)
+
+    def _load_next_log_page(self, first_page=False):
+        """Requests the page after the last loaded row; it is appended when it arrives."""
+        if not first_page and self._log_cursor is None:
+            self._log_page_pending = False
+            return
+        self._log_page_pending = True
+        request = self._log_request
+        self.controller.db.read(database.get_exercise_logs_page, self.controller.current_user_id, page_size=LOG_VIEW_PAGE_SIZE, after=self._log_cursor, with_ids=True,
+                                on_done=lambda result: self._show_log_page(request, first_page, result),
+                                on_error=lambda error: self._log_page_failed(request, error))
+
+    def _log_page_failed(self, request, error):
+        if request != self._log_request:
+            return
+        self._log_page_pending = False
+        self._first_page_loading = False
+        self.log_status_label.config(text="")
+        messagebox.showerror("Error", f"Could not load the exercise history: {error}")
+
+    def _show_log_page(self, request, first_page, result):
+        """Appends a fetched page, unless the history was reloaded while it was in flight."""
+        if request != self._log_request:
             return
+        self._log_page_pending = False
+        self._first_page_loading = False
+        logs, self._log_cursor = result
+        for log in logs:
+            if not self.log_tree.exists(str(log[6])): # Already added at the top as a new row
+                self.log_tree.insert("", tk.END, iid=str(log[6]), values=self._format_log_row(log[:6]))
 
-        logs = database.get_exercise_logs(self.controller.current_user_id)
-        self.log_display.config(state=tk.NORMAL) # Enable for editing
-        self.log_display.delete(1.0, tk.END) # Clear previous content
-
-        if logs:
-            self.log_display.insert(tk.END, "Date/Time             Exercise          Sets Reps Weight Calories\n") # Updated header
-            self.log_display.insert(tk.END, "------------------------------------------------------------------\n") # Adjusted underline
-            for log in logs:
-                exercise_name, sets, reps, weight_kg, calories, log_date = log # Unpack weight_kg
-                weight_display = f"{weight_kg:.1f}" if weight_kg is not None else "N/A" # Format weight or show N/A
-                self.log_display.insert(tk.END, f"{log_date:20s} {exercise_name:15s} {sets:^4d} {reps:^4d} {weight_display:^6s} {calories:^8d}\n") # Updated format
+        if first_page and not logs:
+            self.log_status_label.config(text="No exercise logs found yet.")
         else:
-            self.log_display.insert(tk.END, "No exercise logs found yet.")
+            self.log_status_label.config(text="")
+
+    def _on_log_scroll(self, first, last):
+        """Keeps the scrollbar in sync and fetches another page near the bottom."""
+        self.log_scrollbar.set(first, last)
+        if float(last) >= LOG_VIEW_PREFETCH_AT and self._log_cursor is not None and not self._log_page_pending:
+            self._log_page_pending = True
+            self.after_idle(self._load_next_log_page)
 
-        self.log_display.config(state=tk.DISABLED) # Disable after editing
+    def _append_log_row(self, log_id, log):
+        """Shows a newly logged exercise at the top without reloading the history."""
+        self.log_tree.insert("", 0, iid=str(log_id), values=self._format_log_row(log))
+        self.log_status_label.config(text="")
+
+    def prewarm(self):
+        """Loads the first page of the history before the page is first shown."""
+        self._refresh_exercise_logs()
+
+    def destroy(self):
+        """Stops listening for data changes before the page is destroyed."""
+        database.remove_change_listener(self._on_data_change)
+        super().destroy()
 
     def on_show(self):
         """Method called when this frame is shown."""
-        self._load_exercise_logs()
+        self._refresh_exercise_logs()
@@ -0,0 +1,84 @@
+import numpy as np
+
+from analysis_engine import AGGREGATIONS, aggregate_by_period
+
+# Resampling and downsampling for the progress charts.
+# A chart never needs more points than it has horizontal pixels, so long
+# histories are first bucketed by day/week/month (when requested or chosen
+# automatically from the visible range) and then reduced with
+# Largest-Triangle-Three-Buckets, which keeps the visual shape of the line.
+# Buckets are aggregated by analysis_engine, so charts and the analysis page
+# agree on period boundaries and missing values.
+
+# Resample choices shown in the UI -> period code understood by analysis_engine
+RESAMPLE_BUCKETS = {"Daily": "D", "Weekly": "W", "Monthly": "M"}
+
+# Approximate bucket lengths in seconds, used to pick a bucket automatically
+_BUCKET_SECONDS = (("D", 86400), ("W", 7 * 86400), ("M", 30 * 86400))
+
+def resample(dates, values, bucket, how="sum"):
+    """Aggregates values per bucket ('D', 'W' or 'M') with one of AGGREGATIONS,
+    exactly as WorkoutHistory.totals_by_period does. dates must be sorted
+    datetime64 values. Returns (bucket_starts, aggregated_values).
+    """
+    return aggregate_by_period(dates.astype("datetime64[D]"), values, bucket, how)
+
+def choose_bucket(span_seconds, point_count, max_points):
+    """Picks the finest bucket that keeps the chart under max_points,
+    or None when the raw points already fit.
+    """
+    if point_count <= max_points:
+        return None
+    for bucket, seconds in _BUCKET_SECONDS:
+        if span_seconds / seconds <= max_points:
+            return bucket
+    return _BUCKET_SECONDS[-1][0]
+
+def lttb(x, y, threshold):
+    """Largest-Triangle-Three-Buckets downsampling.
+    Returns the indices of at most threshold points that preserve the shape of
+    the (x, y) series; x must be sorted and numeric.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    # Bucket boundaries for the n - 2 interior points
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    previous = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], max(edges[i + 1], edges[i] + 1)
+        # Average of the next bucket (or the last point) is the third triangle vertex
+        next_start, next_end = end, (edges[i + 2] if i + 2 < len(edges) else n)
+        next_end = max(next_end, next_start + 1)
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+        # Twice the triangle area for every candidate in the current bucket
+        areas = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+def prepare_series(dates, values, max_points, bucket=None, how="sum", auto=True):
+    """Resamples and downsamples a series for plotting into max_points pixels.
+
+    With auto=True and no explicit bucket, the bucket is chosen from the span
+    of dates. Returns (dates, values, bucket_used).
+    """
+    finite = np.isfinite(values) # Unweighted logs are NaN in the weight series
+    if finite.any() and bucket is None and auto:
+        finite_dates = dates[finite]
+        span = (finite_dates[-1] - finite_dates[0]).astype("timedelta64[s]").astype(np.int64)
+        bucket = choose_bucket(span, len(finite_dates), max_points)
+    if bucket is not None:
+        dates, values = resample(dates, values, bucket, how)
+        finite = np.isfinite(values) # e.g. the mean of a bucket without any weights
+    dates, values = dates[finite], values[finite]
+    if len(dates) > max_points:
+        keep = lttb(dates.astype("datetime64[s]").astype(np.int64).astype(float), values, max_points)
+        dates, values = dates[keep], values[keep]
+    return dates, values, bucket
@@ -1,7 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox
 from datetime import datetime
-from PIL import Image, ImageTk
 import os
 from scrolled_frame import ScrolledFrame # Import the custom ScrolledFrame
 
@@ -16,19 +15,17 @@ class DashboardFrame(tk.Frame):
 
         # Assuming this page should retain its background image if configured.
         try:
-            self.bg_image_raw = Image.open(controller.config['dashboard_bg_image'])
-            self.bg_image_tk = None # Will be set on resize
-            self.bg_label = tk.Label(self, image=None)
-            self.bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-            self.bind("<Configure>", self._resize_background)
+            # Rendered by the shared renderer: debounced, cached per size, previewed while dragging
+            self.background = controller.backgrounds.attach(self, controller.config['dashboard_bg_image'])
+            self.bg_label = self.background.label
         except FileNotFoundError:
             messagebox.showerror("Image Error", f"Background image not found: {controller.config['dashboard_bg_image']}")
             self.config(bg="#f0f0f0") # Fallback background color
-            self.bg_image_raw = None
+            self.background = None
         except Exception as e:
             messagebox.showerror("Image Error", f"Error loading background image: {e}")
             self.config(bg="#f0f0f0")
-            self.bg_image_raw = None
+            self.background = None
 
 
         # Content frame, now a ScrolledFrame
@@ -60,16 +57,8 @@ class DashboardFrame(tk.Frame):
 
         tk.Button(content_interior, text="Logout", font=button_font, command=self._logout, **button_style).pack(pady=10, fill='x')
 
-        self.update_datetime() # Start updating date and time
-
-    def _resize_background(self, event):
-        if self.bg_image_raw:
-            width, height = event.width, event.height
-            if width > 0 and height > 0:
-                resized_image = self.bg_image_raw.resize((width, height), Image.Resampling.LANCZOS)
-                self.bg_image_tk = ImageTk.PhotoImage(resized_image)
-                self.bg_label.config(image=self.bg_image_tk)
-                self.bg_label.image = self.bg_image_tk
+        # Updates the date and time every second while the dashboard is shown
+        self.clock_job = controller.ticks.every(self, 1000, self.update_datetime, name="dashboard clock")
 
 
     def update_datetime(self):
@@ -77,7 +66,6 @@ class DashboardFrame(tk.Frame):
         now = datetime.now()
         formatted_datetime = now.strftime("%A, %B %d, %Y\n%H:%M:%S")
         self.datetime_label.config(text=formatted_datetime)
-        self.after(1000, self.update_datetime) # Update every 1 second
 
     def _logout(self):
         """Logs out the current user and returns to the login page."""
@@ -92,4 +80,4 @@ class DashboardFrame(tk.Frame):
             self.welcome_label.config(text=f"Welcome, {self.controller.current_username}!")
         else:
             self.welcome_label.config(text="Welcome!")
-        self.update_datetime() # Ensure datetime is updating
+        # The clock job is resumed (and runs at once) by the tick scheduler when the page is shown
@@ -1,12 +1,79 @@
 import tkinter as tk
 from tkinter import messagebox, scrolledtext
+from datetime import date
+import analytics
 import database
+from analysis_engine import WorkoutHistory
+
+def _build_report(user_id):
+    """Runs on a database worker: computes the analysis and returns it as text lines."""
+    # Every statistic below is computed in SQL; only summary rows are returned
+    summary = analytics.workout_summary(user_id)
+
+    lines = ["--- Workout Analysis ---\n\n"]
+
+    if not summary:
+        lines.append("No workout data to analyze yet.\n")
+        return lines
+
+    lines.append(f"Total Workouts Logged: {summary.total_workouts}\n")
+    lines.append(f"Total Estimated Calories Burned: {summary.total_calories} kcal\n")
+    lines.append(f"Average Sets per Workout: {summary.avg_sets:.1f}\n")
+    lines.append(f"Average Reps per Workout: {summary.avg_reps:.1f}\n")
+
+    streak = analytics.current_streak(user_id)
+    longest = analytics.workout_streaks(user_id, limit=1)
+    lines.append(f"Current Streak: {streak.length_days if streak else 0} day(s)\n")
+    if longest:
+        lines.append(f"Longest Streak: {longest[0].length_days} day(s) ({longest[0].start_date} to {longest[0].end_date})\n")
+    lines.append("\n")
+
+    lines.append("Most Frequent Exercises:\n")
+    for exercise in analytics.top_exercises(user_id, limit=5): # Show top 5
+        lines.append(f"- {exercise.exercise_name}: {exercise.workout_count} workouts\n")
+    lines.append("\n")
+
+    lines.append("Max Weight Lifted (per exercise):\n")
+    records = analytics.personal_records(user_id)
+    if records:
+        for record in records:
+            lines.append(f"- {record.exercise_name}: {record.weight_kg:.1f} kg x {record.reps} reps on {record.log_date[:10]}\n")
+    else:
+        lines.append("No weight data logged yet.\n")
+    lines.append("\n")
+
+    lines.append("Recent Weekly Volume:\n")
+    for week in analytics.volume_by_period(user_id, "week")[-4:]: # Last 4 active weeks
+        lines.append(f"- Week of {week.period_start}: {week.workout_count} workouts, {week.volume_kg:.0f} kg lifted, {week.total_calories} kcal\n")
+    lines.append("\n")
+
+    # Trends are vectorized over the full history, loaded once as NumPy columns
+    history = WorkoutHistory.load(user_id)
+    lines.append("Trends:\n")
+    comparison = history.period_over_period("volume", "W")
+    change = f"{comparison.change_pct:+.1f}%" if comparison.previous_total else "no data the week before"
+    lines.append(f"- Volume in week of {comparison.period_start}: {comparison.current_total:.0f} kg ({change})\n")
+    _, daily_calories = history.rolling_average("calories", window_days=7)
+    lines.append(f"- 7-day average: {daily_calories[-1]:.0f} kcal/day\n")
+    for record in records:
+        _, best_1rm = history.e1rm_trend(record.exercise_name, "M")
+        if len(best_1rm) > 1:
+            lines.append(f"- {record.exercise_name}: est. 1RM {best_1rm[-1]:.1f} kg in the latest month trained (previous: {best_1rm[-2]:.1f} kg)\n")
+        elif len(best_1rm):
+            lines.append(f"- {record.exercise_name}: est. 1RM {best_1rm[-1]:.1f} kg\n")
+
+    return lines
+
+def _analysis_key(user_id):
+    """Identifies the data a report was built from; the streak also depends on today's date."""
+    return (user_id, database.get_data_version(user_id, "exercise_logs"), date.today())
 
 class DataAnalysisFrame(tk.Frame):
     """Frame for displaying insights from workout data."""
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
+        self._analyzed_key = None # _analysis_key() (user_id, data version, date) the displayed analysis was computed for
 
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
@@ -29,65 +96,31 @@ class DataAnalysisFrame(tk.Frame):
                   command=lambda: self.controller.show_frame("DashboardFrame"), relief="raised", bd=3, cursor="hand2", padx=10, pady=5).pack(pady=10)
 
     def _perform_analysis(self):
-        """Analyzes workout data and updates the display."""
+        """Analyzes workout data on a database worker and updates the display."""
+        self._analyzed_key = None
         if not self.controller.current_user_id:
-            self.analysis_display.config(state=tk.NORMAL)
-            self.analysis_display.delete(1.0, tk.END)
-            self.analysis_display.insert(tk.END, "Please log in to analyze your data.")
-            self.analysis_display.config(state=tk.DISABLED)
+            self._show_report(None, ["Please log in to analyze your data."])
             return
 
-        logs = database.get_exercise_logs(self.controller.current_user_id)
-        
+        user_id = self.controller.current_user_id
+        analyzed_key = _analysis_key(user_id)
+        self._show_report(None, ["--- Workout Analysis ---\n\n", "Analyzing your workouts..."])
+        self.controller.db.read(_build_report, user_id, on_done=lambda lines: self._show_report(analyzed_key, lines), error_title="Analysis Error")
+
+    def _show_report(self, analyzed_key, lines):
+        """Replaces the display with the given report lines."""
+        if analyzed_key is not None:
+            if analyzed_key[0] != self.controller.current_user_id:
+                return # The user logged out or changed while the analysis ran
+            self._analyzed_key = analyzed_key
         self.analysis_display.config(state=tk.NORMAL)
         self.analysis_display.delete(1.0, tk.END)
-        self.analysis_display.insert(tk.END, "--- Workout Analysis ---\n\n")
-
-        if not logs:
-            self.analysis_display.insert(tk.END, "No workout data to analyze yet.\n")
-            self.analysis_display.config(state=tk.DISABLED)
-            return
-
-        total_workouts = len(logs)
-        total_calories_burned = sum(log[4] for log in logs) # calories is at index 4
-        
-        # Calculate average sets/reps and max weight lifted
-        total_sets = sum(log[1] for log in logs)
-        total_reps = sum(log[2] for log in logs)
-        
-        avg_sets = total_sets / total_workouts if total_workouts > 0 else 0
-        avg_reps = total_reps / total_workouts if total_workouts > 0 else 0
-
-        # Track max weight lifted per exercise
-        max_weights = {}
-        exercise_counts = {}
-        for log in logs:
-            exercise_name = log[0]
-            weight_kg = log[3]
-            exercise_counts[exercise_name] = exercise_counts.get(exercise_name, 0) + 1
-            if weight_kg is not None:
-                max_weights[exercise_name] = max(max_weights.get(exercise_name, 0), weight_kg)
-
-        self.analysis_display.insert(tk.END, f"Total Workouts Logged: {total_workouts}\n")
-        self.analysis_display.insert(tk.END, f"Total Estimated Calories Burned: {total_calories_burned} kcal\n")
-        self.analysis_display.insert(tk.END, f"Average Sets per Workout: {avg_sets:.1f}\n")
-        self.analysis_display.insert(tk.END, f"Average Reps per Workout: {avg_reps:.1f}\n\n")
-
-        self.analysis_display.insert(tk.END, "Most Frequent Exercises:\n")
-        sorted_exercises = sorted(exercise_counts.items(), key=lambda item: item[1], reverse=True)
-        for name, count in sorted_exercises[:5]: # Show top 5
-            self.analysis_display.insert(tk.END, f"- {name}: {count} workouts\n")
-        self.analysis_display.insert(tk.END, "\n")
-        
-        self.analysis_display.insert(tk.END, "Max Weight Lifted (per exercise):\n")
-        if max_weights:
-            for name, max_w in max_weights.items():
-                self.analysis_display.insert(tk.END, f"- {name}: {max_w:.1f} kg\n")
-        else:
-            self.analysis_display.insert(tk.END, "No weight data logged yet.\n")
-
+        self.analysis_display.insert(tk.END, "".join(lines))
         self.analysis_display.config(state=tk.DISABLED)
 
     def on_show(self):
         """Method called when this frame is shown."""
-        self._perform_analysis()
+        # Skip the analysis when no exercise has been logged since the last visit (on the same day)
+        user_id = self.controller.current_user_id
+        if not user_id or self._analyzed_key != _analysis_key(user_id):
+            self._perform_analysis()
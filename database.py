@@ -1,63 +1,313 @@
 import sqlite3
 import os
+import threading
+from datetime import datetime
+from typing import NamedTuple
+
+import cache
+import migrations
+import rollups
+import utils
 
 # Define the database file path
 DB_FILE = 'fitness_tracker.db'
 
-def connect_db():
-    """Connects to the SQLite database."""
-    conn = sqlite3.connect(DB_FILE)
-    return conn
+# Connection pool settings
+POOL_SIZE = 8 # Maximum number of live connections (one per thread)
+STATEMENT_CACHE_SIZE = 128 # Prepared statements cached per connection
+POOL_TIMEOUT = 5.0 # Seconds to wait for a free slot when the pool is full
 
-def create_tables():
-    """Creates the necessary tables if they don't exist."""
+# Rows inserted per executemany() call by log_exercises_bulk
+BULK_CHUNK_SIZE = 500
+# Rows per page/batch for paginated and streaming log queries
+LOG_PAGE_SIZE = 100
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Inserted rows carried by one DataChange; larger batches publish only their row count
+MAX_CHANGE_ROWS = LOG_PAGE_SIZE
+
+# Read-through caches for get_user and get_goals. Set FITNESS_DB_CACHE=0 (or
+# call set_cache_enabled(False)) to bypass them, e.g. while debugging.
+CACHE_ENABLED = os.environ.get("FITNESS_DB_CACHE", "1").lower() not in ("0", "off", "false", "no")
+USER_CACHE_SIZE = 256 # Usernames cached by get_user
+GOAL_CACHE_SIZE = 64 # (user_id, include_completed) goal lists cached by get_goals
+CACHE_TTL = 300.0 # Seconds before a cached entry is read from the database again
+
+# Storage profiles: PRAGMA settings applied to every new connection.
+# "durable" keeps SQLite's crash-safe defaults, "balanced" switches to WAL so
+# readers no longer block writers, and "fast" trades durability for speed.
+STORAGE_PROFILES = {
+    "durable": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "cache_size": -2000, # Negative values are KiB (2 MB)
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -16000, # 16 MB
+        "mmap_size": 64 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -64000, # 64 MB
+        "mmap_size": 256 * 1024 * 1024,
+        "temp_store": "MEMORY",
+    },
+}
+# Selected per deployment through the FITNESS_DB_PROFILE environment variable
+DEFAULT_STORAGE_PROFILE = "balanced"
+
+class ConnectionPool:
+    """Keeps one long-lived SQLite connection per thread.
+
+    Connections are opened lazily the first time a thread asks for one and are
+    reused for every later call from that thread, so the file open and schema
+    parsing only happen once. Connections of threads that have exited are
+    reclaimed when the pool runs out of slots.
+    """
+    def __init__(self, db_file, pool_size=POOL_SIZE, cached_statements=STATEMENT_CACHE_SIZE, timeout=POOL_TIMEOUT, profile=None):
+        self.db_file = db_file
+        self.profile = profile or os.environ.get("FITNESS_DB_PROFILE", DEFAULT_STORAGE_PROFILE)
+        if self.profile not in STORAGE_PROFILES:
+            raise ValueError(f"Unknown storage profile '{self.profile}'. Choose one of: {', '.join(STORAGE_PROFILES)}")
+        self.pool_size = pool_size
+        self.cached_statements = cached_statements
+        self.timeout = timeout
+        # Keyed by the Thread object, not its ident: idents are reused once a thread
+        # exits, which would hand a new thread a dead thread's connection
+        self._connections = {} # threading.Thread -> sqlite3.Connection
+        self._condition = threading.Condition()
+        self._closed = False
+        self.opened = 0
+        self.reused = 0
+        self.closed = 0
+
+    def get_connection(self):
+        """Returns the calling thread's connection, opening it if needed."""
+        thread = threading.current_thread()
+        with self._condition:
+            if self._closed:
+                raise sqlite3.ProgrammingError("The connection pool has been shut down.")
+            conn = self._connections.get(thread)
+            if conn is not None:
+                self.reused += 1
+                return conn
+            if not self._condition.wait_for(self._has_free_slot, timeout=self.timeout):
+                raise sqlite3.OperationalError(f"Connection pool exhausted ({self.pool_size} connections in use).")
+            conn = self._open()
+            self._connections[thread] = conn
+            self.opened += 1
+            return conn
+
+    def _open(self):
+        # check_same_thread is disabled so that connections of finished threads
+        # can be closed from elsewhere; the pool itself never shares a
+        # connection between two live threads.
+        conn = sqlite3.connect(self.db_file, cached_statements=self.cached_statements, check_same_thread=False)
+        apply_storage_profile(conn, self.profile)
+        return conn
+
+    def _has_free_slot(self):
+        if len(self._connections) < self.pool_size:
+            return True
+        self._reap_dead_threads()
+        return len(self._connections) < self.pool_size
+
+    def _reap_dead_threads(self):
+        """Closes connections whose owning thread is no longer running."""
+        for thread in [thread for thread in self._connections if not thread.is_alive()]:
+            self._close_connection(self._connections.pop(thread))
+
+    def _close_connection(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            print(f"Error closing database connection: {e}")
+        self.closed += 1
+
+    def release(self):
+        """Closes the calling thread's connection (e.g. when a worker thread exits)."""
+        with self._condition:
+            conn = self._connections.pop(threading.current_thread(), None)
+            if conn is not None:
+                self._close_connection(conn)
+                self._condition.notify()
+
+    def close_all(self):
+        """Closes every pooled connection. The pool cannot be used afterwards."""
+        with self._condition:
+            self._closed = True
+            for conn in self._connections.values():
+                self._close_connection(conn)
+            self._connections.clear()
+            self._condition.notify_all()
+
+    def stats(self):
+        """Returns counters describing how connections have been used."""
+        with self._condition:
+            return {
+                "pool_size": self.pool_size,
+                "profile": self.profile,
+                "live": len(self._connections),
+                "opened": self.opened,
+                "reused": self.reused,
+                "closed": self.closed,
+            }
+
+def apply_storage_profile(conn, profile):
+    """Applies the PRAGMA settings of a storage profile to a connection."""
+    for pragma, value in STORAGE_PROFILES[profile].items():
+        conn.execute(f"PRAGMA {pragma} = {value}")
+
+_pool = ConnectionPool(DB_FILE)
+
+def configure_pool(pool_size=None, cached_statements=None, timeout=None, profile=None):
+    """Replaces the connection pool with one using the given settings."""
+    global _pool
+    old_pool = _pool
+    _pool = ConnectionPool(
+        DB_FILE,
+        pool_size=pool_size if pool_size is not None else old_pool.pool_size,
+        cached_statements=cached_statements if cached_statements is not None else old_pool.cached_statements,
+        timeout=timeout if timeout is not None else old_pool.timeout,
+        profile=profile or old_pool.profile,
+    )
+    old_pool.close_all()
+
+def set_storage_profile(profile):
+    """Switches to another storage profile ("durable", "balanced" or "fast")."""
+    configure_pool(profile=profile)
+
+def get_storage_profile():
+    """Returns the active profile name and the PRAGMA values actually in effect."""
     conn = connect_db()
-    cursor = conn.cursor()
+    settings = {}
+    for pragma in STORAGE_PROFILES[_pool.profile]:
+        settings[pragma] = conn.execute(f"PRAGMA {pragma}").fetchone()[0]
+    return _pool.profile, settings
 
-    # Users table for login/signup
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL UNIQUE,
-            password_hash TEXT NOT NULL
-        )
-    ''')
-
-    # Exercise logs table - Added weight_kg column
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS exercise_logs (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            exercise_name TEXT NOT NULL,
-            sets INTEGER NOT NULL,
-            reps INTEGER NOT NULL,
-            weight_kg REAL, -- New column for weight in kg (can be NULL)
-            calories INTEGER NOT NULL,
-            log_date TEXT NOT NULL,
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
-
-    # Goals table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS goals (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            user_id INTEGER NOT NULL,
-            goal_type TEXT NOT NULL, -- e.g., 'Weight Loss', 'Strength', 'Cardio'
-            description TEXT NOT NULL,
-            target_value REAL,
-            current_value REAL,
-            unit TEXT, -- e.g., 'kg', 'km', 'reps', 'sets'
-            start_date TEXT NOT NULL,
-            end_date TEXT,
-            is_completed INTEGER DEFAULT 0, -- 0 for false, 1 for true
-            FOREIGN KEY (user_id) REFERENCES users (id)
-        )
-    ''')
+def connect_db():
+    """Returns the current thread's pooled connection to the SQLite database.
+    The connection stays open; callers must not close it.
+    """
+    return _pool.get_connection()
+
+def release_connection():
+    """Closes the calling thread's pooled connection."""
+    _pool.release()
+
+def close_db():
+    """Closes all pooled connections. Called once when the application exits."""
+    _pool.close_all()
+
+def get_pool_stats():
+    """Returns opened/reused/closed connection counters for the pool."""
+    return _pool.stats()
+
+_user_cache = cache.LRUCache(USER_CACHE_SIZE, CACHE_TTL, name="users")
+_goal_cache = cache.LRUCache(GOAL_CACHE_SIZE, CACHE_TTL, name="goals")
+
+def set_cache_enabled(enabled):
+    """Turns the get_user/get_goals caches on or off; turning them off also empties them."""
+    global CACHE_ENABLED
+    CACHE_ENABLED = enabled
+    if not enabled:
+        clear_caches()
+
+def clear_caches():
+    """Drops every cached user and goal lookup."""
+    _user_cache.clear()
+    _goal_cache.clear()
+
+def get_cache_stats():
+    """Returns hit/miss/eviction counters for each read cache."""
+    return {"enabled": CACHE_ENABLED, "users": _user_cache.stats(), "goals": _goal_cache.stats()}
+
+def _invalidate_goals(user_id):
+    _goal_cache.invalidate_where(lambda key: key[0] == user_id)
+
+class DataChange(NamedTuple):
+    """A committed write, published to the change listeners."""
+    user_id: object # None when the change affects every user
+    table: str # "exercise_logs" or "goals"
+    version: int # get_data_version(user_id, table) after the change
+    action: str # "insert", "update", "delete" or "rebuild"
+    rows: list # Inserted rows: the new id, then the table's insert columns; empty for other actions or large batches
+    count: int = 0 # Number of rows the change affected; len(rows) < count means the rows were left out
+
+# Data versions: a counter per (user_id, table), bumped after every committed
+# write, so pages can tell whether what they last loaded is still current.
+# Versions are kept in memory and only describe writes made by this process.
+_data_versions = {}
+_change_listeners = []
+_versions_lock = threading.Lock()
 
-    conn.commit()
-    conn.close()
-    print("Database tables created or already exist.")
+def _current_version(user_id, table):
+    # Changes published for every user (user_id None) count towards each user's version
+    version = _data_versions.get((None, table), 0)
+    if user_id is not None:
+        version += _data_versions.get((user_id, table), 0)
+    return version
+
+def get_data_version(user_id, table):
+    """Returns the current version of a user's rows in a table."""
+    with _versions_lock:
+        return _current_version(user_id, table)
+
+def add_change_listener(callback):
+    """Registers callback(change) to be called with a DataChange after every write.
+    Listeners run on the thread that made the write, so they should only record
+    the change and leave widget updates to the Tk thread.
+    """
+    with _versions_lock:
+        _change_listeners.append(callback)
+
+def remove_change_listener(callback):
+    """Unregisters a listener added with add_change_listener."""
+    with _versions_lock:
+        if callback in _change_listeners:
+            _change_listeners.remove(callback)
+
+def _publish_change(user_id, table, action, rows=None, count=None):
+    """Bumps the data version of (user_id, table) and notifies the listeners.
+    count defaults to the number of rows.
+    """
+    with _versions_lock:
+        key = (user_id, table)
+        _data_versions[key] = _data_versions.get(key, 0) + 1
+        version = _current_version(user_id, table)
+        listeners = list(_change_listeners)
+    rows = rows or []
+    change = DataChange(user_id, table, version, action, rows, len(rows) if count is None else count)
+    for callback in listeners:
+        try:
+            callback(change)
+        except Exception as e:
+            print(f"Error in data change listener: {e}")
+
+_schema_checked = False
+_schema_lock = threading.Lock()
+
+def create_tables():
+    """Creates the tables or upgrades an existing database to the latest schema.
+    Runs once per process; when PRAGMA user_version is already current only that
+    one PRAGMA is read.
+    """
+    global _schema_checked
+    with _schema_lock:
+        if _schema_checked:
+            return
+        conn = connect_db()
+        if migrations.get_schema_version(conn) < migrations.LATEST_VERSION:
+            migrations.migrate(conn)
+            print(f"Database schema is at version {migrations.get_schema_version(conn)}.")
+        profile, settings = get_storage_profile()
+        print(f"Database storage profile: {profile} ({', '.join(f'{k}={v}' for k, v in settings.items())})")
+        _schema_checked = True
 
 def add_user(username, password_hash):
     """Adds a new user to the database."""
@@ -67,20 +317,24 @@ def add_user(username, password_hash):
         cursor.execute("INSERT INTO users (username, password_hash) VALUES (?, ?)",
                        (username, password_hash))
         conn.commit()
+        _user_cache.invalidate(username) # Drops a cached "no such user"
         return True
     except sqlite3.IntegrityError:
+        conn.rollback()
         print(f"Error: Username '{username}' already exists.")
         return False
-    finally:
-        conn.close()
 
 def get_user(username):
     """Retrieves a user's data by username."""
+    if CACHE_ENABLED:
+        return _user_cache.get_or_load(username, lambda: _query_user(username))
+    return _query_user(username)
+
+def _query_user(username):
     conn = connect_db()
     cursor = conn.cursor()
     cursor.execute("SELECT id, username, password_hash FROM users WHERE username = ?", (username,))
     user = cursor.fetchone()
-    conn.close()
     return user # Returns (id, username, password_hash) or None
 
 def log_exercise(user_id, exercise_name, sets, reps, weight_kg, calories, log_date):
@@ -92,26 +346,224 @@ def log_exercise(user_id, exercise_name, sets, reps, weight_kg, calories, log_da
             "INSERT INTO exercise_logs (user_id, exercise_name, sets, reps, weight_kg, calories, log_date) VALUES (?, ?, ?, ?, ?, ?, ?)",
             (user_id, exercise_name, sets, reps, weight_kg, calories, log_date)
         )
+        log_id = cursor.lastrowid
+        # Keep the materialized aggregates in step, within the same transaction
+        rollups.apply_logs(conn, user_id, [(exercise_name, sets, reps, weight_kg, calories, log_date)])
         conn.commit()
-        return True
     except Exception as e:
+        conn.rollback()
         print(f"Error logging exercise: {e}")
         return False
-    finally:
-        conn.close()
+    _publish_change(user_id, "exercise_logs", "insert", [(log_id, exercise_name, sets, reps, weight_kg, calories, log_date)])
+    return True
+
+_LOG_FIELDS = ("exercise_name", "sets", "reps", "weight_kg", "calories", "log_date")
 
-def get_exercise_logs(user_id):
-    """Retrieves all exercise logs for a specific user, including weight."""
+def _normalize_log_row(row):
+    """Validates one bulk-import row and returns it in INSERT column order.
+    Rows are (exercise_name, sets, reps, weight_kg, calories, log_date)
+    tuples or dicts with those keys.
+    """
+    if isinstance(row, dict):
+        values = [row.get(field) for field in _LOG_FIELDS]
+    else:
+        values = list(row)
+        if len(values) != len(_LOG_FIELDS):
+            raise ValueError(f"Expected {len(_LOG_FIELDS)} fields ({', '.join(_LOG_FIELDS)}), got {len(values)}.")
+    exercise_name, sets, reps, weight_kg, calories = utils.validate_exercise_entry(*values[:5])
+    log_date = values[5]
+    try:
+        datetime.strptime(str(log_date), LOG_DATE_FORMAT)
+    except ValueError:
+        raise ValueError(f"Log date must be in YYYY-MM-DD HH:MM:SS format, got {log_date!r}.")
+    return exercise_name, sets, reps, weight_kg, calories, log_date
+
+def _chunked(iterable, size):
+    """Yields lists of at most size items without materializing the iterable."""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _insert_log_chunk(conn, user_id, chunk, errors):
+    """Inserts one chunk of validated rows; returns the rows actually inserted.
+    If executemany fails, the chunk is rolled back to its savepoint and
+    retried row by row so only the offending rows are reported.
+    """
+    sql = "INSERT INTO exercise_logs (user_id, exercise_name, sets, reps, weight_kg, calories, log_date) VALUES (?, ?, ?, ?, ?, ?, ?)"
+    conn.execute("SAVEPOINT log_chunk")
+    try:
+        conn.executemany(sql, [(user_id,) + values for _, values in chunk])
+        conn.execute("RELEASE SAVEPOINT log_chunk")
+        return [values for _, values in chunk]
+    except sqlite3.Error:
+        conn.execute("ROLLBACK TO SAVEPOINT log_chunk")
+
+    inserted = []
+    for index, values in chunk:
+        try:
+            conn.execute(sql, (user_id,) + values)
+            inserted.append(values)
+        except sqlite3.Error as e:
+            errors.append((index, str(e)))
+    conn.execute("RELEASE SAVEPOINT log_chunk")
+    return inserted
+
+def log_exercises_bulk(user_id, rows, chunk_size=BULK_CHUNK_SIZE):
+    """Logs many exercise entries for a user in a single transaction.
+
+    rows may be any iterable or generator of (exercise_name, sets, reps,
+    weight_kg, calories, log_date) tuples or dicts; it is consumed in chunks of
+    chunk_size, so large imports are never held in memory at once. Invalid
+    rows are skipped and reported instead of aborting the batch.
+
+    Returns (inserted_count, errors) where errors is a list of
+    (row_index, message) tuples.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+    conn = connect_db()
+    inserted_count = 0
+    inserted_rows = None # Published with the change event only when the batch is small
+    errors = []
+    try:
+        conn.execute("BEGIN IMMEDIATE") # Holds the write lock throughout, so every id above last_id is ours
+        last_id = conn.execute("SELECT COALESCE(MAX(id), 0) FROM exercise_logs").fetchone()[0]
+        for chunk in _chunked(enumerate(rows), chunk_size):
+            valid_rows = []
+            for index, row in chunk:
+                try:
+                    valid_rows.append((index, _normalize_log_row(row)))
+                except (TypeError, ValueError) as e:
+                    errors.append((index, str(e)))
+            if valid_rows:
+                chunk_rows = _insert_log_chunk(conn, user_id, valid_rows, errors)
+                rollups.apply_logs(conn, user_id, chunk_rows)
+                inserted_count += len(chunk_rows)
+        if 0 < inserted_count <= MAX_CHANGE_ROWS:
+            inserted_rows = conn.execute(f"SELECT id, {_LOG_COLUMNS} FROM exercise_logs WHERE id > ? ORDER BY id",
+                                         (last_id,)).fetchall()
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"Error bulk logging exercises: {e}")
+        raise
+    if inserted_count:
+        _publish_change(user_id, "exercise_logs", "insert", inserted_rows, inserted_count)
+    return inserted_count, errors
+
+_LOG_COLUMNS = "exercise_name, sets, reps, weight_kg, calories, log_date"
+
+def log_filter_clause(user_id, start_date=None, end_date=None, exercise_name=None):
+    """Builds the WHERE clause shared by the exercise log queries.
+    start_date is inclusive and end_date exclusive; both are compared as
+    'YYYY-MM-DD[ HH:MM:SS]' strings so the (user_id, log_date) index is used.
+    """
+    clauses = ["user_id = ?"]
+    params = [user_id]
+    if exercise_name:
+        clauses.append("exercise_name = ?")
+        params.append(exercise_name)
+    if start_date:
+        clauses.append("log_date >= ?")
+        params.append(start_date)
+    if end_date:
+        clauses.append("log_date < ?")
+        params.append(end_date)
+    return " AND ".join(clauses), params
+
+def get_exercise_logs(user_id, start_date=None, end_date=None, exercise_name=None):
+    """Retrieves exercise logs for a specific user, including weight, newest first.
+    Optional date-range and exercise-name filters are applied in SQL.
+    """
     conn = connect_db()
     cursor = conn.cursor()
+    where, params = log_filter_clause(user_id, start_date, end_date, exercise_name)
     cursor.execute(
-        "SELECT exercise_name, sets, reps, weight_kg, calories, log_date FROM exercise_logs WHERE user_id = ? ORDER BY log_date DESC",
-        (user_id,)
+        f"SELECT {_LOG_COLUMNS} FROM exercise_logs WHERE {where} ORDER BY log_date DESC, id DESC",
+        params
     )
     logs = cursor.fetchall()
-    conn.close()
     return logs # Returns a list of (exercise_name, sets, reps, weight_kg, calories, log_date) tuples
 
+def get_exercise_logs_page(user_id, page_size=LOG_PAGE_SIZE, after=None, ascending=False,
+                           start_date=None, end_date=None, exercise_name=None, with_ids=False):
+    """Retrieves one page of a user's exercise logs using keyset pagination.
+
+    after is the cursor returned with the previous page (None for the first
+    page). Pages seek directly to (log_date, id) through the index, so the cost
+    of a page does not depend on how far into the history it is.
+
+    Returns (logs, next_cursor); next_cursor is None on the last page. With
+    with_ids each log also ends with its id.
+    """
+    conn = connect_db()
+    cursor = conn.cursor()
+    where, params = log_filter_clause(user_id, start_date, end_date, exercise_name)
+    if after is not None:
+        where += " AND (log_date, id) > (?, ?)" if ascending else " AND (log_date, id) < (?, ?)"
+        params.extend(after)
+    order = "ASC" if ascending else "DESC"
+    # Fetch one extra row to find out whether another page follows
+    cursor.execute(
+        f"SELECT {_LOG_COLUMNS}, id FROM exercise_logs WHERE {where} ORDER BY log_date {order}, id {order} LIMIT ?",
+        params + [page_size + 1]
+    )
+    rows = cursor.fetchall()
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    next_cursor = (rows[-1][5], rows[-1][6]) if has_more else None
+    return (rows if with_ids else [row[:6] for row in rows]), next_cursor
+
+def iter_exercise_logs(user_id, batch_size=LOG_PAGE_SIZE, ascending=False,
+                       start_date=None, end_date=None, exercise_name=None):
+    """Yields a user's exercise logs one at a time, reading batch_size rows per fetchmany().
+    Only one batch is held in memory; close the generator if it is abandoned early.
+    """
+    conn = connect_db()
+    cursor = conn.cursor()
+    where, params = log_filter_clause(user_id, start_date, end_date, exercise_name)
+    order = "ASC" if ascending else "DESC"
+    cursor.execute(
+        f"SELECT {_LOG_COLUMNS} FROM exercise_logs WHERE {where} ORDER BY log_date {order}, id {order}",
+        params
+    )
+    try:
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield from batch
+    finally:
+        cursor.close()
+
+def get_rollup_summary(user_id):
+    """Returns the materialized statistics for a user as (user_totals, exercise_rows).
+    user_totals is (workout_count, total_sets, total_reps, total_calories,
+    first_log_date, last_log_date) or None if nothing has been logged; see
+    rollups.get_exercise_rollups for the per-exercise row layout.
+    """
+    conn = connect_db()
+    return rollups.get_user_rollup(conn, user_id), rollups.get_exercise_rollups(conn, user_id)
+
+def rebuild_rollups(user_id=None):
+    """Recomputes the rollup tables from scratch for one user or all users."""
+    conn = connect_db()
+    try:
+        conn.execute("BEGIN")
+        rollups.rebuild(conn, user_id)
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"Error rebuilding rollups: {e}")
+        raise
+    # The rollups are derived from the logs, so readers of either must refresh
+    _publish_change(user_id, "exercise_logs", "rebuild")
+
 def add_goal(user_id, goal_type, description, target_value, current_value, unit, start_date, end_date=None, is_completed=0):
     """Adds a new fitness goal for a user."""
     conn = connect_db()
@@ -121,16 +573,24 @@ def add_goal(user_id, goal_type, description, target_value, current_value, unit,
             "INSERT INTO goals (user_id, goal_type, description, target_value, current_value, unit, start_date, end_date, is_completed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
             (user_id, goal_type, description, target_value, current_value, unit, start_date, end_date, is_completed)
         )
+        goal_id = cursor.lastrowid
         conn.commit()
-        return True
     except Exception as e:
+        conn.rollback()
         print(f"Error adding goal: {e}")
         return False
-    finally:
-        conn.close()
+    _invalidate_goals(user_id)
+    _publish_change(user_id, "goals", "insert", [(goal_id, goal_type, description, target_value, current_value, unit, start_date, end_date, is_completed)])
+    return True
 
 def get_goals(user_id, include_completed=False):
     """Retrieves goals for a specific user."""
+    if CACHE_ENABLED:
+        # A copy is returned so callers cannot modify the cached list
+        return list(_goal_cache.get_or_load((user_id, include_completed), lambda: _query_goals(user_id, include_completed)))
+    return _query_goals(user_id, include_completed)
+
+def _query_goals(user_id, include_completed):
     conn = connect_db()
     cursor = conn.cursor()
     if include_completed:
@@ -138,40 +598,46 @@ def get_goals(user_id, include_completed=False):
     else:
         cursor.execute("SELECT id, goal_type, description, target_value, current_value, unit, start_date, end_date, is_completed FROM goals WHERE user_id = ? AND is_completed = 0 ORDER BY end_date ASC", (user_id,))
     goals = cursor.fetchall()
-    conn.close()
     return goals
 
+def _goal_owner(cursor, goal_id):
+    """Returns the user_id of a goal, or None if it does not exist."""
+    row = cursor.execute("SELECT user_id FROM goals WHERE id = ?", (goal_id,)).fetchone()
+    return row[0] if row else None
+
 def update_goal_progress(goal_id, new_current_value, is_completed=None):
     """Updates the current progress of a goal."""
     conn = connect_db()
     cursor = conn.cursor()
     try:
+        user_id = _goal_owner(cursor, goal_id)
         if is_completed is not None:
             cursor.execute("UPDATE goals SET current_value = ?, is_completed = ? WHERE id = ?", (new_current_value, is_completed, goal_id))
         else:
             cursor.execute("UPDATE goals SET current_value = ? WHERE id = ?", (new_current_value, goal_id))
         conn.commit()
-        return True
     except Exception as e:
+        conn.rollback()
         print(f"Error updating goal: {e}")
         return False
-    finally:
-        conn.close()
+    if user_id is not None:
+        _invalidate_goals(user_id)
+        _publish_change(user_id, "goals", "update")
+    return True
 
 def delete_goal(goal_id):
     """Deletes a goal by its ID."""
     conn = connect_db()
     cursor = conn.cursor()
     try:
+        user_id = _goal_owner(cursor, goal_id)
         cursor.execute("DELETE FROM goals WHERE id = ?", (goal_id,))
         conn.commit()
-        return True
     except Exception as e:
+        conn.rollback()
         print(f"Error deleting goal: {e}")
         return False
-    finally:
-        conn.close()
-
-
-# Ensure tables are created when the module is imported
-create_tables()
+    if user_id is not None:
+        _invalidate_goals(user_id)
+        _publish_change(user_id, "goals", "delete")
+    return True
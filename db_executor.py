@@ -0,0 +1,161 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+
+# Runs database work off the Tk event loop.
+# Writes go to a single writer thread, so they are applied one at a time in
+# the order they were submitted and never compete for SQLite's write lock.
+# Reads run on a small pool, each worker using its own pooled connection.
+# Tk widgets may only be touched from the main thread, so results are not
+# delivered from the workers: the Tk loop polls the pending futures with
+# after() and runs the callbacks itself.
+# A job that has not started by its deadline is cancelled and reported as a
+# timeout. A job that is already running cannot be cancelled, so it is never
+# reported as failed while it may still succeed: a slow write shows a "still
+# saving" notice once and its callbacks run with the real outcome when it
+# finishes (otherwise a retry after a false timeout would save twice).
+# run_in_background() is the same submit-and-poll loop for other background
+# work (image decoding, imports, chart renders), without deadlines.
+
+READ_WORKERS = 3 # Keep READ_WORKERS + 1 writer well below database.POOL_SIZE
+DEFAULT_TIMEOUT = 10.0 # Seconds before a job is abandoned and reported as timed out
+POLL_MS = 20 # How often the Tk loop checks for finished jobs
+
+def run_in_background(root, executor, func, *args, on_done=None, on_error=None, poll_ms=POLL_MS, **kwargs):
+    """Runs func(*args, **kwargs) on executor and returns the Future.
+    on_done(result) runs on the Tk thread once it has finished; on_error(exception)
+    does too and defaults to Tk's callback error report. Nothing runs if the
+    Future is cancelled.
+    """
+    future = executor.submit(func, *args, **kwargs)
+    root.after(poll_ms, _poll_future, root, future, on_done, on_error, poll_ms)
+    return future
+
+def _poll_future(root, future, on_done, on_error, poll_ms):
+    if not future.done():
+        root.after(poll_ms, _poll_future, root, future, on_done, on_error, poll_ms)
+        return
+    if future.cancelled():
+        return
+    error = future.exception()
+    if error is None:
+        if on_done is not None:
+            on_done(future.result())
+    elif on_error is not None:
+        on_error(error)
+    else:
+        root.report_callback_exception(type(error), error, error.__traceback__)
+
+class _Job:
+    """A submitted function and the callbacks waiting for it."""
+    __slots__ = ("future", "on_done", "on_error", "deadline", "error_title", "on_slow")
+
+    def __init__(self, future, on_done, on_error, deadline, error_title, on_slow):
+        self.future = future
+        self.on_done = on_done
+        self.on_error = on_error
+        self.deadline = deadline
+        self.error_title = error_title
+        self.on_slow = on_slow # Called once if the job is still running at its deadline
+
+class DBExecutor:
+    """Submits database functions to worker threads and resolves them back on the Tk thread."""
+    def __init__(self, root, read_workers=READ_WORKERS, timeout=DEFAULT_TIMEOUT):
+        self.root = root
+        self.timeout = timeout
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+        self._readers = ThreadPoolExecutor(max_workers=read_workers, thread_name_prefix="db-reader")
+        self._jobs = [] # _Job instances whose callbacks have not run yet
+        self._poll_id = None
+
+    def read(self, func, *args, on_done=None, on_error=None, timeout=None, error_title="Database Error", **kwargs):
+        """Runs func(*args, **kwargs) on the read pool. Returns the Future.
+        on_done(result) runs on the Tk thread; on_error(exception) does too and
+        defaults to showing error_title in a messagebox.
+        """
+        return self._submit(self._readers, func, args, kwargs, on_done, on_error, timeout, error_title, None)
+
+    def write(self, func, *args, on_done=None, on_error=None, timeout=None, error_title="Database Error",
+              on_slow=None, **kwargs):
+        """Runs func(*args, **kwargs) on the writer thread, after every write submitted before it.
+        A write that has started is never timed out: if it is still running at the
+        deadline, on_slow() is called (default: a "still saving" notice) and
+        on_done/on_error run once it has finished.
+        """
+        return self._submit(self._writer, func, args, kwargs, on_done, on_error, timeout, error_title,
+                            on_slow or self._still_saving)
+
+    def _submit(self, executor, func, args, kwargs, on_done, on_error, timeout, error_title, on_slow):
+        future = executor.submit(func, *args, **kwargs)
+        deadline = time.monotonic() + (timeout if timeout is not None else self.timeout)
+        self._jobs.append(_Job(future, on_done, on_error, deadline, error_title, on_slow))
+        if self._poll_id is None:
+            self._poll_id = self.root.after(POLL_MS, self._poll)
+        return future
+
+    def _poll(self):
+        """Tk thread: runs the callbacks of finished jobs and times out overdue ones."""
+        self._poll_id = None
+        now = time.monotonic()
+        finished, waiting = [], []
+        for job in self._jobs:
+            if job.future.done() or (now >= job.deadline and job.future.cancel()):
+                finished.append(job) # Done, or cancelled before it started
+            else:
+                if now >= job.deadline:
+                    self._overdue(job)
+                waiting.append(job)
+        self._jobs = waiting # Callbacks may submit new jobs
+
+        for job in finished:
+            try:
+                self._resolve(job)
+            except Exception:
+                # A failing callback must not prevent the others from running
+                self.root.report_callback_exception(*sys.exc_info())
+
+        if self._jobs and self._poll_id is None:
+            self._poll_id = self.root.after(POLL_MS, self._poll)
+
+    def _overdue(self, job):
+        """A running job passed its deadline: it keeps being polled for its real outcome."""
+        if job.on_slow is not None:
+            on_slow, job.on_slow = job.on_slow, None # Only once per job
+            try:
+                on_slow()
+            except Exception:
+                self.root.report_callback_exception(*sys.exc_info())
+
+    def _still_saving(self):
+        messagebox.showinfo("Still Saving", "The database is busy. Your changes are still being saved; please do not submit them again.")
+
+    def _resolve(self, job):
+        if job.future.cancelled():
+            # Only jobs that never started are cancelled, so trying again is safe
+            self._report(TimeoutError("The database did not respond in time. Please try again."), job.on_error, job.error_title)
+            return
+        error = job.future.exception()
+        if error is not None:
+            self._report(error, job.on_error, job.error_title)
+        elif job.on_done is not None:
+            job.on_done(job.future.result())
+
+    def _report(self, error, on_error, error_title):
+        if on_error is not None:
+            on_error(error)
+        else:
+            messagebox.showerror(error_title, str(error))
+
+    def pending(self):
+        """Returns the number of jobs whose callbacks have not run yet."""
+        return len(self._jobs)
+
+    def shutdown(self):
+        """Stops the workers; queued writes still run so nothing logged is lost."""
+        if self._poll_id is not None:
+            self.root.after_cancel(self._poll_id)
+            self._poll_id = None
+        self._jobs = []
+        self._readers.shutdown(wait=True, cancel_futures=True)
+        self._writer.shutdown(wait=True)
@@ -1,7 +1,10 @@
 import tkinter as tk
 from tkinter import messagebox, scrolledtext # Import scrolledtext
-from PIL import Image, ImageTk, ImageSequence # Import ImageSequence for GIF frames
+from PIL import Image, ImageTk
 import os
+import time
+
+from thumbnails import TILE_SIZE
 
 class ExerciseSelectionFrame(tk.Frame):
     """Frame for selecting exercises from a tile-based layout."""
@@ -80,48 +83,52 @@ class ExerciseSelectionFrame(tk.Frame):
         # Clear existing tiles
         for widget in self.tiles_frame.winfo_children():
             widget.destroy()
+        self.tile_buttons = {}
 
+        # Every tile is laid out straight away with a blank image; the thumbnails are
+        # cut from one pre-built atlas and filled in when it has loaded
+        self.blank_tile = tk.PhotoImage(width=TILE_SIZE[0], height=TILE_SIZE[1]) # Keep reference
         row_idx, col_idx = 0, 0
-        tile_size = (150, 150) # Desired size for the tile images
-
         for exercise in self.exercises:
-            try:
-                # Load icon image (these are typically static, e.g., JPG/PNG)
-                img_raw = Image.open(exercise["icon"])
-                img_resized = img_raw.resize(tile_size, Image.Resampling.LANCZOS)
-                img_tk = ImageTk.PhotoImage(img_resized)
-                self.exercise_tiles[exercise["name"]] = img_tk # Keep reference
-
-                tile_button = tk.Button(self.tiles_frame, image=img_tk, text=exercise["name"], compound="top",
-                                       font=("Inter", 12, "bold"), fg=self.controller.config['text_color'],
-                                       bg=self.controller.config['tile_bg_color'], relief="raised", bd=3,
-                                       cursor="hand2", padx=10, pady=10,
-                                       command=lambda e=exercise: self._show_exercise_demo(e))
-                tile_button.grid(row=row_idx, column=col_idx, padx=10, pady=10, sticky="nsew")
-
-            except FileNotFoundError:
-                messagebox.showerror("Image Error", f"Exercise icon not found: {exercise['icon']}")
-                # Create a fallback button if image is missing
-                tile_button = tk.Button(self.tiles_frame, text=f"{exercise['name']}\n(Image Missing)", compound="top",
-                                       font=("Inter", 12, "bold"), fg=self.controller.config['text_color'],
-                                       bg=self.controller.config['tile_bg_color'], relief="raised", bd=3,
-                                       cursor="hand2", padx=10, pady=10,
-                                       command=lambda e=exercise: self._show_exercise_demo(e))
-                tile_button.grid(row=row_idx, column=col_idx, padx=10, pady=10, sticky="nsew")
-            except Exception as e:
-                messagebox.showerror("Image Error", f"Error loading exercise icon {exercise['icon']}: {e}")
-                tile_button = tk.Button(self.tiles_frame, text=f"{exercise['name']}\n(Error)", compound="top",
-                                       font=("Inter", 12, "bold"), fg=self.controller.config['text_color'],
-                                       bg=self.controller.config['tile_bg_color'], relief="raised", bd=3,
-                                       cursor="hand2", padx=10, pady=10,
-                                       command=lambda e=exercise: self._show_exercise_demo(e))
-                tile_button.grid(row=row_idx, column=col_idx, padx=10, pady=10, sticky="nsew")
+            tile_button = tk.Button(self.tiles_frame, image=self.blank_tile, text=exercise["name"], compound="top",
+                                   font=("Inter", 12, "bold"), fg=self.controller.config['text_color'],
+                                   bg=self.controller.config['tile_bg_color'], relief="raised", bd=3,
+                                   cursor="hand2", padx=10, pady=10,
+                                   command=lambda e=exercise: self._show_exercise_demo(e))
+            tile_button.grid(row=row_idx, column=col_idx, padx=10, pady=10, sticky="nsew")
+            self.tile_buttons[exercise["name"]] = tile_button
 
             col_idx += 1
             if col_idx > 2: # 3 columns per row
                 col_idx = 0
                 row_idx += 1
 
+        icons = [exercise["icon"] for exercise in self.exercises]
+        cached = self.controller.thumbnails.cached(icons, TILE_SIZE)
+        if cached is not None:
+            self._show_tile_images(*cached)
+        else:
+            self.controller.thumbnails.load(icons, self._show_tile_images, TILE_SIZE)
+
+    def _show_tile_images(self, tiles, errors):
+        """Puts the loaded thumbnails on the tiles, with a fallback label for icons that failed."""
+        for exercise in self.exercises:
+            tile_button = self.tile_buttons.get(exercise["name"])
+            if tile_button is None or not tile_button.winfo_exists():
+                continue
+            error = errors.get(exercise["icon"])
+            if error is None:
+                img_tk = tiles[exercise["icon"]]
+                self.exercise_tiles[exercise["name"]] = img_tk # Keep reference
+                tile_button.config(image=img_tk)
+            elif isinstance(error, FileNotFoundError):
+                messagebox.showerror("Image Error", f"Exercise icon not found: {exercise['icon']}")
+                # Fall back to a text-only tile if the image is missing
+                tile_button.config(image="", text=f"{exercise['name']}\n(Image Missing)")
+            else:
+                messagebox.showerror("Image Error", f"Error loading exercise icon {exercise['icon']}: {error}")
+                tile_button.config(image="", text=f"{exercise['name']}\n(Error)")
+
     def _show_exercise_demo(self, exercise):
         """Switches to the ExerciseDemoFrame for the selected exercise, passing exercise data."""
         self.controller.show_frame("ExerciseDemoFrame", exercise_data=exercise)
@@ -133,9 +140,10 @@ class ExerciseDemoFrame(tk.Frame):
         super().__init__(parent)
         self.controller = controller
         self.current_exercise = None
-        self.gif_frames = []        # To store PhotoImage objects for GIF frames
+        self.gif_sequence = None    # GifSequence being animated; frames become PhotoImages as they are shown
         self.current_gif_frame = 0  # Current frame index for GIF animation
-        self.gif_animation_id = None # Stores the after() ID for GIF animation
+        self.gif_job = controller.ticks.add(self, self._animate_gif, name="gif animation") # Paused while the page is hidden
+        self._gif_generation = 0    # Bumped whenever an animation starts or stops
 
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
@@ -216,7 +224,7 @@ class ExerciseDemoFrame(tk.Frame):
                     self._start_gif_animation(img_path)
                 else:
                     # Handle static image (JPG/PNG)
-                    img_raw = Image.open(img_path)
+                    img_raw = self.controller.assets.image(img_path, owner="ExerciseDemoFrame")
                     self._display_static_image(img_raw)
 
             except FileNotFoundError:
@@ -260,77 +268,90 @@ class ExerciseDemoFrame(tk.Frame):
         self.gif_display_image = None # Ensure GIF reference is cleared
 
     def _start_gif_animation(self, gif_path):
-        """Loads GIF frames and starts the animation."""
-        self.gif_frames = []
+        """Shows the first GIF frame immediately and starts the animation once all
+        frames are available (at once if they are cached in memory).
+        """
+        self.gif_sequence = None
         self.current_gif_frame = 0
+        self._gif_generation += 1
+        # Decreased max_width and max_height for the exercise demo GIF frames
+        max_size = (350, 350)
+        gif_cache = self.controller.gif_cache
         try:
-            img = Image.open(gif_path)
-            # Decreased max_width and max_height for the exercise demo GIF frames
-            max_width = 350
-            max_height = 350
-
-            for frame in ImageSequence.Iterator(img):
-                # Ensure each frame is converted to RGBA to avoid issues with paletted images
-                frame = frame.convert("RGBA")
-                original_width, original_height = frame.size
-                aspect_ratio = original_width / original_height
-
-                if original_width > max_width or original_height > max_height:
-                    if aspect_ratio > 1: # Wider than tall
-                        new_width = max_width
-                        new_height = int(max_width / aspect_ratio)
-                    else: # Taller than wide or square
-                        new_height = max_height
-                        new_width = int(max_height * aspect_ratio)
-                else:
-                    new_width, new_height = original_width, original_height
-
-                resized_frame = frame.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                self.gif_frames.append(ImageTk.PhotoImage(resized_frame))
-
-            self.demo_image_label.config(text="") # Clear text before animation
-            self._animate_gif() # Start the animation loop
+            sequence = gif_cache.cached(gif_path, max_size)
+            if sequence is not None:
+                self.gif_sequence = sequence
+                self.demo_image_label.config(text="") # Clear text before animation
+                self.gif_job.start() # Start the animation loop
+                return
+
+            # Frames are read from the disk cache (or decoded) in the background meanwhile
+            self.gif_display_image = gif_cache.first_frame(gif_path, max_size, owner="ExerciseDemoFrame")
+            self.demo_image_label.config(image=self.gif_display_image, text="")
+            self.demo_image_label.image = self.gif_display_image
+            generation = self._gif_generation
+            shown_at = time.monotonic()
+            gif_cache.load(gif_path, max_size,
+                           on_ready=lambda sequence: self._gif_frames_ready(generation, shown_at, sequence),
+                           on_error=lambda error: self._gif_failed(generation, error))
 
         except Exception as e:
-            messagebox.showerror("GIF Error", f"Could not load or animate GIF: {e}")
-            self.demo_image_label.config(image=None, text="GIF Error")
-            self.gif_frames = []
-            self.demo_image_tk = None
-            self.gif_display_image = None
+            self._gif_failed(self._gif_generation, e)
+
+    def _gif_frames_ready(self, generation, shown_at, sequence):
+        """Continues the animation from the first frame, which is already on screen."""
+        if generation != self._gif_generation:
+            return # Another exercise was opened, or the animation was stopped, in the meantime
+        self.gif_sequence = sequence
+        self.current_gif_frame = 1 % len(sequence)
+        elapsed_ms = int((time.monotonic() - shown_at) * 1000)
+        self.gif_job.start(sequence.durations[0] - elapsed_ms)
+
+    def _gif_failed(self, generation, error):
+        if generation != self._gif_generation:
+            return
+        messagebox.showerror("GIF Error", f"Could not load or animate GIF: {error}")
+        self.demo_image_label.config(image=None, text="GIF Error")
+        self.gif_sequence = None
+        self.demo_image_tk = None
+        self.gif_display_image = None
 
 
     def _animate_gif(self):
-        """Updates the GIF frame displayed."""
-        if not self.gif_frames:
+        """Updates the GIF frame displayed. Returns the delay until the next frame."""
+        if self.gif_sequence is None:
             self._stop_gif_animation()
-            return
+            return None
 
         # Use a new variable for the current frame to ensure reference
-        self.gif_display_image = self.gif_frames[self.current_gif_frame]
+        self.gif_display_image = self.gif_sequence.photo(self.current_gif_frame)
         self.demo_image_label.config(image=self.gif_display_image)
         self.demo_image_label.image = self.gif_display_image # Explicitly keep reference here
 
-        self.current_gif_frame = (self.current_gif_frame + 1) % len(self.gif_frames)
-
-        # Set delay to 0.5 seconds (500 milliseconds)
-        delay = 500
-
-        # Check if the label is still visible on the screen to avoid errors
-        # This is a robust way to ensure we don't try to animate a destroyed widget
-        if self.demo_image_label.winfo_exists():
-            self.gif_animation_id = self.after(delay, self._animate_gif)
-        else:
-            self._stop_gif_animation() # Stop if label no longer exists
+        # Each frame stays up for its own duration from the GIF
+        delay = self.gif_sequence.durations[self.current_gif_frame]
+        self.current_gif_frame = (self.current_gif_frame + 1) % len(self.gif_sequence)
+        return delay
 
     def _stop_gif_animation(self):
         """Stops any ongoing GIF animation."""
-        if self.gif_animation_id:
-            self.after_cancel(self.gif_animation_id)
-            self.gif_animation_id = None
-        self.gif_frames = [] # Clear frames to free memory
+        self.gif_job.stop()
+        self._gif_generation += 1 # Ignore frames still loading for the stopped animation
+        self.gif_sequence = None # The frame cache keeps recently used sequences
         self.current_gif_frame = 0
         self.gif_display_image = None # Clear the current PhotoImage reference
 
+    def on_hide(self):
+        """Lets go of the demo's frames while the page is hidden; it is only shown again
+        from the exercise list, which reloads the demo (from memory if it is cached).
+        """
+        self._stop_gif_animation()
+
+    def destroy(self):
+        """Stops the animation, and ignores frames still loading, before the page is destroyed."""
+        self._stop_gif_animation()
+        super().destroy()
+
     def on_show(self, exercise_data=None):
         """Method called when this frame is shown."""
         if exercise_data:
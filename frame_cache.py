@@ -0,0 +1,186 @@
+import os
+import time
+import tkinter as tk
+import tracemalloc
+from tkinter import ttk
+from PIL import Image, ImageTk
+
+# Eviction policy for FitnessApp.frames.
+# The least recently shown pages are destroyed while over the page count or the
+# memory budget, or once idle for IDLE_SECONDS; create_frame rebuilds them.
+# The budget also covers the app's shared image caches, which count their own
+# images; pages built ahead of time but never shown do not count as live pages.
+
+MAX_LIVE_PAGES = int(os.environ.get("FITNESS_MAX_PAGES", "6"))
+MEMORY_BUDGET_BYTES = int(float(os.environ.get("FITNESS_PAGE_BUDGET_MB", "200")) * 1024 * 1024)
+SHARED_CACHES = ("assets", "backgrounds", "gif_cache", "thumbnails") # App attributes with memory_bytes() and cached_images()
+IDLE_SECONDS = 600.0 # Pages not shown for this long are destroyed at the next navigation
+PINNED_PAGES = ("LoginFrame", "DashboardFrame")
+# FITNESS_TRACEMALLOC=1 adds the Python memory allocated while building each page to its estimate
+TRACEMALLOC = os.environ.get("FITNESS_TRACEMALLOC", "0").lower() in ("1", "on", "true", "yes")
+
+WIDGET_BYTES = 2048 # Rough cost of one Tk widget (Python wrapper and Tcl side)
+TABLE_ROW_BYTES = 256 # Rough cost of one Treeview row
+MAX_DEPTH = 4 # How far page attributes are followed when estimating memory
+
+class FrameCache:
+    """Tracks when pages were last shown and destroys the least recently used ones."""
+    def __init__(self, app, max_pages=MAX_LIVE_PAGES, budget_bytes=MEMORY_BUDGET_BYTES,
+                 idle_seconds=IDLE_SECONDS, pinned=PINNED_PAGES, trace=TRACEMALLOC):
+        self.app = app
+        self.max_pages = max_pages
+        self.budget_bytes = budget_bytes
+        self.idle_seconds = idle_seconds
+        self.pinned = set(pinned)
+        self._last_used = {} # page name -> time.monotonic() when last shown (or built)
+        self._built_bytes = {} # page name -> Python memory allocated while building it (tracemalloc)
+        self._sizes = {} # page name -> estimate from its last measurement
+        self._shown = set() # Live pages that have been shown since they were built
+        self.evictions = 0
+        self.rebuilds = 0
+        self._evicted = set()
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def building(self):
+        """Call before constructing a page; returns a token for built()."""
+        return tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else None
+
+    def built(self, page_name, token):
+        """Records a newly constructed page."""
+        if token is not None:
+            self._built_bytes[page_name] = max(tracemalloc.get_traced_memory()[0] - token, 0)
+        if page_name in self._evicted:
+            self._evicted.discard(page_name)
+            self.rebuilds += 1
+        self._last_used[page_name] = time.monotonic()
+
+    def touch(self, page_name):
+        """Records that a page was just shown."""
+        self._last_used[page_name] = time.monotonic()
+        self._shown.add(page_name)
+
+    def hidden(self, page_name):
+        """Re-measures a page as it is hidden, once it has loaded what it shows."""
+        self._sizes[page_name] = self.frame_bytes(page_name)
+
+    def cached_bytes(self, page_name):
+        """Returns the last measurement of a page, measuring it if it has none yet."""
+        if page_name not in self._sizes:
+            self._sizes[page_name] = self.frame_bytes(page_name)
+        return self._sizes[page_name]
+
+    def frame_bytes(self, page_name):
+        """Returns the approximate memory held by a live page, in bytes."""
+        frame = self.app.frames.get(page_name)
+        if frame is None:
+            return 0
+        # Services, and images held by the shared caches, are counted by shared_bytes()
+        shared = {id(self.app)} | {id(value) for value in vars(self.app).values()}
+        shared |= {id(image) for cache in self._caches() for image in cache.cached_images()}
+        return estimate_bytes(frame, shared) + self._built_bytes.get(page_name, 0)
+
+    def _caches(self):
+        return [getattr(self.app, name) for name in SHARED_CACHES if hasattr(self.app, name)]
+
+    def shared_bytes(self):
+        """Returns the memory held by the shared image caches, in bytes."""
+        return sum(cache.memory_bytes() for cache in self._caches())
+
+    def trim(self):
+        """Destroys least recently used pages while over a limit. Returns the pages evicted.
+        Only pages that have been shown count towards max_pages, so pages pre-warmed
+        in the background are not evicted to make room for the next one opened.
+        """
+        if self.app.db.pending():
+            return [] # A database callback may still be on its way to one of the pages
+        frames = self.app.frames
+        sizes = {page_name: self.cached_bytes(page_name) for page_name in frames}
+        total = sum(sizes.values()) + self.shared_bytes()
+        shown = len(self._shown & set(frames))
+        now = time.monotonic()
+        evicted = []
+        candidates = [page_name for page_name in frames
+                      if page_name not in self.pinned and page_name != self.app.current_page]
+        for page_name in sorted(candidates, key=lambda name: self._last_used.get(name, 0)):
+            idle = now - self._last_used.get(page_name, 0) >= self.idle_seconds
+            was_shown = page_name in self._shown
+            if not idle and not (was_shown and shown > self.max_pages) and total <= self.budget_bytes:
+                continue # Kept; a more recent page may still be over the page count
+            self.evict(page_name)
+            total -= sizes[page_name]
+            shown -= was_shown
+            evicted.append(page_name)
+        return evicted
+
+    def evict(self, page_name):
+        """Destroys a page; create_frame rebuilds it when it is next shown."""
+        frame = self.app.frames.pop(page_name, None)
+        if frame is None:
+            return
+        self.app.ticks.forget(frame)
+        frame.destroy()
+        self._built_bytes.pop(page_name, None)
+        self._sizes.pop(page_name, None)
+        self._shown.discard(page_name)
+        self._evicted.add(page_name)
+        self.evictions += 1
+        print(f"Released page {page_name}")
+
+    def report(self):
+        """Returns {page name: approximate bytes} for every live page, largest first."""
+        sizes = {page_name: self.frame_bytes(page_name) for page_name in self.app.frames}
+        return dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True))
+
+def estimate_bytes(frame, shared=()):
+    """Approximates the memory a page holds: its widgets, plus the images, arrays
+    and strings reachable from its attributes (objects in shared are skipped).
+    Pages can add anything this misses with a memory_bytes() method.
+    """
+    total = 0
+    widgets = [frame]
+    while widgets:
+        widget = widgets.pop()
+        total += WIDGET_BYTES
+        if isinstance(widget, tk.Text):
+            total += len(widget.get("1.0", "end-1c"))
+        elif isinstance(widget, ttk.Treeview):
+            total += len(widget.get_children()) * TABLE_ROW_BYTES
+        widgets.extend(widget.winfo_children())
+    seen = set(shared)
+    total += sum(_value_bytes(value, seen, 0) for value in vars(frame).values())
+    if hasattr(frame, "memory_bytes"):
+        total += frame.memory_bytes()
+    return total
+
+def _value_bytes(value, seen, depth):
+    if depth > MAX_DEPTH or id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (tk.PhotoImage, ImageTk.PhotoImage)):
+        return value.width() * value.height() * 4 # Tk keeps 32-bit pixels
+    if isinstance(value, (tk.Misc, type)) or callable(value):
+        return 0 # Widgets are counted separately; methods lead back to their objects
+    if isinstance(value, Image.Image):
+        return value.width * value.height * len(value.getbands())
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    nbytes = getattr(value, "nbytes", None) # numpy arrays
+    if isinstance(nbytes, int):
+        return nbytes
+    if isinstance(value, dict):
+        return sum(_value_bytes(item, seen, depth + 1) for item in value.values())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sum(_value_bytes(item, seen, depth + 1) for item in value)
+    return sum(_value_bytes(item, seen, depth + 1) for item in _attributes(value))
+
+def _attributes(value):
+    """Yields an object's attribute values, from its __dict__ and its __slots__
+    (e.g. WorkoutHistory keeps its numpy columns in slots).
+    """
+    yield from getattr(value, "__dict__", {}).values()
+    for cls in type(value).__mro__:
+        slots = cls.__dict__.get("__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ("__dict__", "__weakref__") and hasattr(value, name):
+                yield getattr(value, name)
@@ -0,0 +1,189 @@
+import json
+import math
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from tkinter import messagebox
+from PIL import Image, ImageSequence, ImageTk
+from PIL.PngImagePlugin import PngInfo
+
+from db_executor import run_in_background
+
+# Frame cache for animated GIF demos.
+# Decoding, converting and LANCZOS-resizing every frame of a demo GIF is slow,
+# so the resized frames are stored on disk as one PNG "strip" (a grid of
+# frames plus their durations), keyed by the GIF's content hash and the target
+# size. Opening a demo then only has to read one PNG, and that happens on a
+# background thread while the first frame is already on screen. PhotoImages
+# can only be created on the Tk thread, so the worker returns PIL frames and
+# each one is converted when the animation first reaches it. The most recently
+# opened demos stay in memory up to MEMORY_BUDGET_BYTES.
+
+CACHE_DIR = ".frame_cache" # Relative to the working directory, like the database file
+STRIP_VERSION = 1 # Bump when the strip format changes so old files are ignored
+# Frames kept in memory for reopened demos, at width x height x 4 bytes each
+MEMORY_BUDGET_BYTES = int(float(os.environ.get("FITNESS_GIF_CACHE_MB", "40")) * 1024 * 1024)
+DEFAULT_FRAME_MS = 100 # Used when a GIF frame has no duration
+MIN_FRAME_MS = 20 # Browsers also slow down frames shorter than this
+
+def fit_size(size, max_size):
+    """Scales (width, height) down to fit inside max_size, keeping the aspect ratio."""
+    width, height = size
+    max_width, max_height = max_size
+    if width <= max_width and height <= max_height:
+        return width, height
+    scale = min(max_width / width, max_height / height)
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+def _frame_duration(frame):
+    return max(frame.info.get("duration") or DEFAULT_FRAME_MS, MIN_FRAME_MS)
+
+def decode_frames(gif_path, max_size):
+    """Decodes every frame as RGBA resized to fit max_size. Returns (frames, durations_ms)."""
+    frames, durations = [], []
+    with Image.open(gif_path) as image:
+        target = fit_size(image.size, max_size)
+        for frame in ImageSequence.Iterator(image):
+            durations.append(_frame_duration(frame))
+            # Ensure each frame is converted to RGBA to avoid issues with paletted images
+            frames.append(frame.convert("RGBA").resize(target, Image.Resampling.LANCZOS))
+    return frames, durations
+
+def save_strip(path, frames, durations):
+    """Writes frames as a grid in one PNG, with the durations in a text chunk."""
+    width, height = frames[0].size
+    columns = math.ceil(math.sqrt(len(frames)))
+    rows = math.ceil(len(frames) / columns)
+    strip = Image.new("RGBA", (columns * width, rows * height))
+    for index, frame in enumerate(frames):
+        strip.paste(frame, ((index % columns) * width, (index // columns) * height))
+    info = PngInfo()
+    info.add_text("frames", json.dumps({"columns": columns, "size": [width, height], "durations": durations}))
+    # Write to a temporary file first so a crash never leaves a truncated strip behind
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    strip.save(temp_path, format="PNG", pnginfo=info, compress_level=1) # Fast to write and read back
+    os.replace(temp_path, path)
+
+def load_strip(path):
+    """Reads a strip written by save_strip. Returns (frames, durations_ms)."""
+    with Image.open(path) as strip:
+        strip.load()
+        layout = json.loads(strip.text["frames"])
+        columns = layout["columns"]
+        width, height = layout["size"]
+        frames = []
+        for index in range(len(layout["durations"])):
+            left, top = (index % columns) * width, (index // columns) * height
+            frames.append(strip.crop((left, top, left + width, top + height)))
+    return frames, layout["durations"]
+
+class GifSequence:
+    """The frames of one demo, converted to PhotoImages as the animation reaches them."""
+    def __init__(self, frames, durations):
+        self._frames = list(frames) # PIL frames; each is dropped once converted
+        self._photos = [None] * len(self._frames)
+        self.durations = durations
+        width, height = self._frames[0].size
+        self.nbytes = width * height * 4 * len(self._frames) # RGBA in PIL or 32-bit pixels in Tk
+
+    def __len__(self):
+        return len(self._photos)
+
+    def photo(self, index):
+        """Returns frame index as a PhotoImage, converting it on first use."""
+        photo = self._photos[index]
+        if photo is None:
+            photo = self._photos[index] = ImageTk.PhotoImage(self._frames[index])
+            self._frames[index] = None
+        return photo
+
+class GifFrameCache:
+    """Supplies resized GIF frames as PhotoImages, from memory, the disk cache or a fresh decode."""
+    def __init__(self, root, assets, cache_dir=CACHE_DIR, budget_bytes=MEMORY_BUDGET_BYTES):
+        self.root = root
+        self.assets = assets
+        self.cache_dir = cache_dir
+        self.budget_bytes = budget_bytes
+        self._sequences = OrderedDict() # (digest, max_size) -> GifSequence, least recently used first
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="gif-decoder")
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.decodes = 0
+
+    def _key(self, gif_path, max_size):
+        return self.assets.digest(gif_path), tuple(max_size)
+
+    def strip_path(self, digest, max_size):
+        return os.path.join(self.cache_dir, f"{digest[:32]}_{max_size[0]}x{max_size[1]}_v{STRIP_VERSION}.png")
+
+    def cached(self, gif_path, max_size):
+        """Returns the GifSequence if it is in memory, else None."""
+        key = self._key(gif_path, max_size)
+        sequence = self._sequences.get(key)
+        if sequence is not None:
+            self._sequences.move_to_end(key)
+            self.memory_hits += 1
+        return sequence
+
+    def first_frame(self, gif_path, max_size, owner=None):
+        """Returns a PhotoImage of the first frame, to show while the rest are loading."""
+        image = self.assets.image(gif_path, owner)
+        image.seek(0)
+        return ImageTk.PhotoImage(image.convert("RGBA").resize(fit_size(image.size, max_size), Image.Resampling.LANCZOS))
+
+    def load(self, gif_path, max_size, on_ready, on_error=None):
+        """Loads the frames on the decoder thread and calls on_ready(sequence) on the
+        Tk thread with a GifSequence. on_error(exception) defaults to a messagebox.
+        """
+        key = self._key(gif_path, max_size)
+        if on_error is None:
+            on_error = lambda e: messagebox.showerror("GIF Error", f"Could not load or animate GIF: {e}")
+        return run_in_background(self.root, self._executor, self._read_frames, gif_path, key,
+                                 on_done=lambda result: self._frames_read(key, *result, on_ready), on_error=on_error)
+
+    def _read_frames(self, gif_path, key):
+        """Decoder thread: reads the disk strip, or decodes the GIF and writes the strip."""
+        digest, max_size = key
+        path = self.strip_path(digest, max_size)
+        if os.path.exists(path):
+            try:
+                frames, durations = load_strip(path)
+                self.disk_hits += 1
+                return frames, durations
+            except (OSError, KeyError, ValueError) as e:
+                print(f"Ignoring unreadable frame cache {path}: {e}")
+        frames, durations = decode_frames(gif_path, max_size)
+        self.decodes += 1
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            save_strip(path, frames, durations)
+        except OSError as e:
+            print(f"Could not write frame cache {path}: {e}") # Still usable, just not cached on disk
+        return frames, durations
+
+    def _frames_read(self, key, frames, durations, on_ready):
+        """Tk thread: keeps the sequence while the memory budget allows and hands it over."""
+        sequence = GifSequence(frames, durations)
+        self._sequences[key] = sequence
+        self._sequences.move_to_end(key)
+        # A demo larger than the whole budget is only held by the page playing it
+        while self._sequences and self.memory_bytes() > self.budget_bytes:
+            self._sequences.popitem(last=False)
+        on_ready(sequence)
+
+    def cached_images(self):
+        """Returns the sequences held in memory."""
+        return list(self._sequences.values())
+
+    def memory_bytes(self):
+        """Returns the memory of the sequences held, in bytes."""
+        return sum(sequence.nbytes for sequence in self._sequences.values())
+
+    def stats(self):
+        """Returns memory/disk hit and decode counters."""
+        return {"in_memory": len(self._sequences), "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits, "decodes": self.decodes}
+
+    def shutdown(self):
+        """Stops the decoder thread."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
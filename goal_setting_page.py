@@ -9,6 +9,7 @@ class GoalSettingFrame(tk.Frame):
     def __init__(self, parent, controller):
         super().__init__(parent)
         self.controller = controller
+        self._loaded_key = None # (user_id, data version) of the goals being shown
 
         self.grid_rowconfigure(0, weight=1)
         self.grid_columnconfigure(0, weight=1)
@@ -93,7 +94,11 @@ class GoalSettingFrame(tk.Frame):
                 messagebox.showerror("Input Error", "End Date must be in YYYY-MM-DD format or left empty.")
                 return
 
-        if database.add_goal(self.controller.current_user_id, goal_type, description, target_value, current_value, unit, start_date, end_date_str):
+        self.controller.db.write(database.add_goal, self.controller.current_user_id, goal_type, description, target_value, current_value, unit, start_date, end_date_str,
+                                 on_done=self._goal_added, error_title="Error")
+
+    def _goal_added(self, added):
+        if added:
             messagebox.showinfo("Success", "Goal added successfully!")
             self._clear_goal_entries()
             self._load_goals()
@@ -105,6 +110,7 @@ class GoalSettingFrame(tk.Frame):
             self.entries[entry_name].delete(0, tk.END)
 
     def _load_goals(self):
+        self._loaded_key = None
         if not self.controller.current_user_id:
             self.goals_display.config(state=tk.NORMAL)
             self.goals_display.delete(1.0, tk.END)
@@ -112,7 +118,14 @@ class GoalSettingFrame(tk.Frame):
             self.goals_display.config(state=tk.DISABLED)
             return
 
-        goals = database.get_goals(self.controller.current_user_id)
+        user_id = self.controller.current_user_id
+        loaded_key = (user_id, database.get_data_version(user_id, "goals"))
+        self.controller.db.read(database.get_goals, user_id, on_done=lambda goals: self._show_goals(loaded_key, goals), error_title="Goals Error")
+
+    def _show_goals(self, loaded_key, goals):
+        if loaded_key[0] != self.controller.current_user_id:
+            return # The user logged out or changed while the goals were loading
+        self._loaded_key = loaded_key
         self.goals_display.config(state=tk.NORMAL)
         self.goals_display.delete(1.0, tk.END)
 
@@ -143,7 +156,14 @@ class GoalSettingFrame(tk.Frame):
 
         self.goals_display.config(state=tk.DISABLED)
 
+    def prewarm(self):
+        """Loads the goals before the page is first shown."""
+        self.on_show()
+
     def on_show(self):
         """Method called when this frame is shown."""
-        self._load_goals()
+        # Skip the query when no goal has changed since the last visit
+        user_id = self.controller.current_user_id
+        if not user_id or self._loaded_key != (user_id, database.get_data_version(user_id, "goals")):
+            self._load_goals()
 
@@ -1,24 +1,27 @@
+import time
+_started = time.perf_counter() # Start of the startup timing breakdown
+
 import tkinter as tk
 from tkinter import messagebox
-from PIL import Image, ImageTk # Used for image handling
 import os
-import matplotlib.pyplot as plt # Import matplotlib.pyplot as plt
 
-# Import all custom modules
+# Page modules are imported on demand through the page registry (see page_registry.py)
 import database
-import utils
-from auth_page import LoginFrame, SignupFrame
-from dashboard_page import DashboardFrame
-from bmi_page import BMICalculatorFrame
-from calorie_tracker_page import CalorieTrackerFrame
-from exercise_page import ExerciseSelectionFrame, ExerciseDemoFrame
-from goal_setting_page import GoalSettingFrame # New import
-from progress_tracking_page import ProgressTrackingFrame # New import
-from data_analysis_page import DataAnalysisFrame # New import
+from db_executor import DBExecutor
+from assets import AssetManager
+from background_renderer import BackgroundRenderer
+from gif_cache import GifFrameCache
+from frame_cache import FrameCache
+from page_registry import PageRegistry
+from prewarm import PrewarmScheduler
+from thumbnails import TILE_SIZE, ThumbnailPipeline
+from tick_scheduler import TickScheduler
 
 class FitnessApp(tk.Tk):
     """Main application class for the Fitness Tracker."""
     def __init__(self, *args, **kwargs):
+        self.startup_times = [("imports", time.perf_counter() - _started)] # (step, seconds)
+        self._step_started = time.perf_counter()
         super().__init__(*args, **kwargs)
 
         self.title("Fitness Tracker")
@@ -78,8 +81,21 @@ class FitnessApp(tk.Tk):
             os.makedirs("images")
             messagebox.showinfo("Image Directory Created", "The 'images' directory has been created. Please place your image files inside it and update the 'config' in main.py with the correct names.")
 
-        # Initialize database
+        self._mark_startup("window")
+
+        # Initialize database (a no-op apart from one PRAGMA when the schema is current)
         database.create_tables()
+        self._mark_startup("schema check")
+        # Pages run their database calls through self.db so SQLite I/O never blocks the event loop
+        self.db = DBExecutor(self)
+        # Images are loaded once through the asset manager and shared by every page
+        self.assets = AssetManager()
+        self.backgrounds = BackgroundRenderer(self, self.assets)
+        self.gif_cache = GifFrameCache(self, self.assets)
+        self.thumbnails = ThumbnailPipeline(self, self.assets)
+        # Periodic page work (clocks, animations) is scheduled here and paused while its page is hidden
+        self.ticks = TickScheduler(self)
+        self._mark_startup("services")
 
         self.current_user_id = None
         self.current_username = None
@@ -91,22 +107,20 @@ class FitnessApp(tk.Tk):
         self.container.grid_columnconfigure(0, weight=1)
 
         self.frames = {}
-        # List of all frame classes
-        self.frame_classes = {
-            "LoginFrame": LoginFrame,
-            "SignupFrame": SignupFrame,
-            "DashboardFrame": DashboardFrame,
-            "BMICalculatorFrame": BMICalculatorFrame,
-            "CalorieTrackerFrame": CalorieTrackerFrame,
-            "ExerciseSelectionFrame": ExerciseSelectionFrame,
-            "ExerciseDemoFrame": ExerciseDemoFrame,
-            "GoalSettingFrame": GoalSettingFrame, # New frame class
-            "ProgressTrackingFrame": ProgressTrackingFrame, # New frame class
-            "DataAnalysisFrame": DataAnalysisFrame # New frame class
-        }
+        self.current_page = None # Name of the page on display
+        # Destroys pages that have not been used for a while; they are rebuilt when shown again
+        self.frame_cache = FrameCache(self)
+        # All frame classes, by page name; each page module is imported the first time it is needed
+        self.frame_classes = PageRegistry()
+        # Builds likely-next pages in idle time after login (started by LoginFrame)
+        self.prewarm = PrewarmScheduler(self)
 
         # Create the initial LoginFrame immediately
         self.create_frame("LoginFrame")
+        self._mark_startup("login page")
+
+        # Close pooled database connections cleanly when the window is closed
+        self.protocol("WM_DELETE_WINDOW", self.shutdown)
 
 
     def create_frame(self, page_name):
@@ -115,9 +129,12 @@ class FitnessApp(tk.Tk):
             FrameClass = self.frame_classes.get(page_name)
             if FrameClass:
                 # No side image path needed for any frame now
+                token = self.frame_cache.building()
                 frame = FrameClass(parent=self.container, controller=self)
                 self.frames[page_name] = frame
+                self.frame_cache.built(page_name, token)
                 frame.grid(row=0, column=0, sticky="nsew")
+                frame.lower() # Frames built in the background must not cover the page on display
             else:
                 messagebox.showerror("Error", f"Unknown page: {page_name}")
                 return None
@@ -125,22 +142,78 @@ class FitnessApp(tk.Tk):
 
     def show_frame(self, page_name, **kwargs): # Added **kwargs
         """Shows a frame for the given page name, creating it if necessary.
-           Passes additional kwargs to the frame's on_show method.
+           Passes additional kwargs to the frame's on_show method, and calls
+           on_hide() on the frame that was on display, if it has one.
         """
+        self.prewarm.cancel() # The user is navigating; stop building pages in the background
+        started = time.perf_counter()
         frame = self.create_frame(page_name)
         if frame:
+            previous = self.frames.get(self.current_page)
+            if previous is not None and previous is not frame:
+                if hasattr(previous, 'on_hide'):
+                    previous.on_hide()
+                self.frame_cache.hidden(self.current_page)
+            self.current_page = page_name
+            self.assets.touch(page_name)
+            self.assets.evict_idle() # Frees images only used by frames not shown for a while
             frame.tkraise()
+            # Hidden frames still get <Configure> events and timers; only the shown one does the work
+            self.ticks.show(frame)
+            self.backgrounds.show(frame)
             # If the frame has an 'on_show' method, call it with kwargs
             if hasattr(frame, 'on_show'):
                 frame.on_show(**kwargs) # Pass kwargs here
+            self.prewarm.record_show(page_name, time.perf_counter() - started) # Only the first show is kept
+            self.frame_cache.touch(page_name)
+            self.frame_cache.trim() # Keeps the live pages within the page count and memory budget
+
+    def shutdown(self):
+        """Releases application resources and closes the main window."""
+        self.db.shutdown() # Waits for queued writes before the connections are closed
+        self.gif_cache.shutdown()
+        self.thumbnails.shutdown()
+        self.prewarm.shutdown()
+        tick_stats = self.ticks.stats()
+        print(f"Timers: {tick_stats['jobs']} jobs, {tick_stats['live']} live, {tick_stats['paused']} paused, {tick_stats['ticks']} runs")
+        self.ticks.shutdown()
+        for line in self.prewarm.stats():
+            print(f"Page {line}")
+        for page_name, size in self.frame_cache.report().items():
+            print(f"Live page {page_name}: ~{size // 1024} KiB")
+        print(f"Pages released: {self.frame_cache.evictions}, rebuilt: {self.frame_cache.rebuilds}")
+        stats = database.get_pool_stats()
+        print(f"Database connections opened: {stats['opened']}, reused: {stats['reused']}")
+        cache_stats = database.get_cache_stats()
+        for name in ("users", "goals"):
+            counters = cache_stats[name]
+            print(f"{name.capitalize()} cache: {counters['hits']} hits, {counters['misses']} misses, {counters['evictions']} evictions")
+        for asset in self.assets.memory_report():
+            print(f"Image {', '.join(asset['paths'])}: {asset['decoded_bytes'] // 1024} KiB decoded, "
+                  f"decoded {asset['decodes']} time(s)")
+        print(f"Images in Tk: backgrounds {self.backgrounds.memory_bytes() // 1024} KiB, "
+              f"GIF demos {self.gif_cache.memory_bytes() // 1024} KiB, thumbnails {self.thumbnails.memory_bytes() // 1024} KiB")
+        database.close_db()
+        self.destroy()
+
+    def _mark_startup(self, step):
+        """Records how long a startup step took, measured from the end of the previous one."""
+        now = time.perf_counter()
+        self.startup_times.append((step, now - self._step_started))
+        self._step_started = now
 
     def start(self):
         """Starts the application by showing the initial frame."""
         self.show_frame("LoginFrame")
+        self.update_idletasks() # Lay out the login window before measuring
+        self._mark_startup("first layout")
+        total = time.perf_counter() - _started
+        print(f"Login window ready in {total * 1000:.0f} ms: "
+              + ", ".join(f"{step} {seconds * 1000:.0f} ms" for step, seconds in self.startup_times))
+        # Build the exercise tile atlas in the background once the login window is up
+        self.after_idle(self.thumbnails.pregenerate, [path for key, path in self.config.items() if key.endswith("_icon")], TILE_SIZE)
 
 if __name__ == "__main__":
-    # Ensure matplotlib is not in interactive mode to prevent extra windows
-    plt.ioff()
     app = FitnessApp()
     app.start() # Call the new start method to display the initial frame
     app.mainloop()
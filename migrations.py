@@ -0,0 +1,123 @@
+import sqlite3
+from datetime import datetime
+
+import rollups
+
+# Versioned schema migrations for fitness_tracker.db.
+# Each migration runs once, inside its own transaction, and is recorded both in
+# the schema_version table and in PRAGMA user_version. To change the schema,
+# append a new migration to MIGRATIONS instead of editing an earlier one, so
+# that existing databases are upgraded in place.
+
+def _create_base_tables(conn):
+    """Users, exercise logs and goals tables."""
+    # Users table for login/signup
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            password_hash TEXT NOT NULL
+        )
+    ''')
+
+    # Exercise logs table (weight_kg is added by migration 2)
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS exercise_logs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            exercise_name TEXT NOT NULL,
+            sets INTEGER NOT NULL,
+            reps INTEGER NOT NULL,
+            calories INTEGER NOT NULL,
+            log_date TEXT NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+
+    # Goals table
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS goals (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER NOT NULL,
+            goal_type TEXT NOT NULL, -- e.g., 'Weight Loss', 'Strength', 'Cardio'
+            description TEXT NOT NULL,
+            target_value REAL,
+            current_value REAL,
+            unit TEXT, -- e.g., 'kg', 'km', 'reps', 'sets'
+            start_date TEXT NOT NULL,
+            end_date TEXT,
+            is_completed INTEGER DEFAULT 0, -- 0 for false, 1 for true
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+
+def _add_weight_column(conn):
+    """Weight in kg for exercise logs (can be NULL)."""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(exercise_logs)")]
+    if "weight_kg" not in columns:
+        conn.execute("ALTER TABLE exercise_logs ADD COLUMN weight_kg REAL")
+
+def _add_lookup_indexes(conn):
+    """Composite indexes for per-user log and goal queries."""
+    # get_exercise_logs: WHERE user_id = ? ORDER BY log_date DESC
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_exercise_logs_user_date ON exercise_logs (user_id, log_date)")
+    # Per-exercise history and statistics for a user
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_exercise_logs_user_exercise_date ON exercise_logs (user_id, exercise_name, log_date)")
+    # get_goals: WHERE user_id = ? [AND is_completed = 0] ORDER BY end_date
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_goals_user_completed_end ON goals (user_id, is_completed, end_date)")
+
+def _add_rollup_tables(conn):
+    """Materialized per-user and per-exercise aggregates, backfilled from existing logs."""
+    rollups.create_tables(conn)
+    rollups.rebuild(conn)
+
+# (version, description, function) in the order they must be applied
+MIGRATIONS = [
+    (1, "Create users, exercise_logs and goals tables", _create_base_tables),
+    (2, "Add exercise_logs.weight_kg column", _add_weight_column),
+    (3, "Add composite indexes for exercise_logs and goals", _add_lookup_indexes),
+    (4, "Add user_rollups and exercise_rollups tables", _add_rollup_tables),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def get_schema_version(conn):
+    """Returns the schema version stored in PRAGMA user_version."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn):
+    """Applies every pending migration and returns the list of versions applied."""
+    current_version = get_schema_version(conn)
+    if current_version >= LATEST_VERSION:
+        return []
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
+    ''')
+    conn.commit()
+
+    applied = []
+    for version, description, migration in MIGRATIONS:
+        if version <= current_version:
+            continue
+        try:
+            conn.execute("BEGIN")
+            migration(conn)
+            conn.execute(
+                "INSERT OR REPLACE INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (version, description, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+            # user_version lives in the database header and is part of the transaction
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except sqlite3.Error as e:
+            conn.rollback()
+            print(f"Error applying schema migration {version} ({description}): {e}")
+            raise
+        applied.append(version)
+        print(f"Applied schema migration {version}: {description}")
+    return applied
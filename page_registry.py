@@ -0,0 +1,69 @@
+import importlib
+import os
+import sys
+import time
+from collections.abc import Mapping
+
+# Lazy registry of page classes.
+# Importing a page module can be expensive (the progress page pulls in
+# matplotlib and numpy), so FitnessApp.frame_classes maps page names to
+# (module, class) pairs and a module is only imported the first time one of
+# its pages is looked up. The login window therefore never waits on imports
+# for pages the user has not opened yet. Set FITNESS_LAZY_PAGES=0 to import
+# every page module up front instead.
+
+LAZY_PAGES = os.environ.get("FITNESS_LAZY_PAGES", "1").lower() not in ("0", "off", "false", "no")
+
+# Page name -> (module, class name)
+PAGES = {
+    "LoginFrame": ("auth_page", "LoginFrame"),
+    "SignupFrame": ("auth_page", "SignupFrame"),
+    "DashboardFrame": ("dashboard_page", "DashboardFrame"),
+    "BMICalculatorFrame": ("bmi_page", "BMICalculatorFrame"),
+    "CalorieTrackerFrame": ("calorie_tracker_page", "CalorieTrackerFrame"),
+    "ExerciseSelectionFrame": ("exercise_page", "ExerciseSelectionFrame"),
+    "ExerciseDemoFrame": ("exercise_page", "ExerciseDemoFrame"),
+    "GoalSettingFrame": ("goal_setting_page", "GoalSettingFrame"),
+    "ProgressTrackingFrame": ("progress_tracking_page", "ProgressTrackingFrame"),
+    "DataAnalysisFrame": ("data_analysis_page", "DataAnalysisFrame"),
+}
+
+class PageRegistry(Mapping):
+    """Read-only mapping of page name -> frame class that imports page modules on first use."""
+    def __init__(self, pages=PAGES, lazy=LAZY_PAGES):
+        self._pages = dict(pages)
+        self._classes = {}
+        self.import_times = {} # module name -> seconds spent importing it
+        if not lazy:
+            for page_name in self._pages:
+                self[page_name]
+
+    def __getitem__(self, page_name):
+        FrameClass = self._classes.get(page_name)
+        if FrameClass is None:
+            module_name, class_name = self._pages[page_name]
+            already_imported = module_name in sys.modules # e.g. by the pre-warm thread
+            started = time.perf_counter()
+            module = importlib.import_module(module_name)
+            if not already_imported and module_name not in self.import_times:
+                self.import_times[module_name] = time.perf_counter() - started
+                print(f"Imported {module_name} in {self.import_times[module_name] * 1000:.0f} ms")
+            FrameClass = self._classes[page_name] = getattr(module, class_name)
+        return FrameClass
+
+    def __contains__(self, page_name):
+        return page_name in self._pages # Without importing the module
+
+    def __iter__(self):
+        return iter(self._pages)
+
+    def __len__(self):
+        return len(self._pages)
+
+    def module_name(self, page_name):
+        """Returns the name of the module that defines the page."""
+        return self._pages[page_name][0]
+
+    def is_loaded(self, page_name):
+        """Returns whether the page's module has already been imported."""
+        return page_name in self._classes
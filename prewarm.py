@@ -0,0 +1,128 @@
+import importlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from db_executor import run_in_background
+
+# Idle-time pre-warming of the pages a user is likely to open next.
+# After login, pages are imported, built and warmed one slice per idle callback
+# until the user navigates.
+
+# Set FITNESS_PREWARM=0 to disable, or to a comma-separated list of page names
+PREWARM_SETTING = os.environ.get("FITNESS_PREWARM", "1").strip()
+PREWARM_ENABLED = PREWARM_SETTING.lower() not in ("0", "off", "false", "no")
+# Most-used dashboard targets first
+DEFAULT_PAGES = ("ProgressTrackingFrame", "ExerciseSelectionFrame", "CalorieTrackerFrame", "GoalSettingFrame")
+if PREWARM_ENABLED and PREWARM_SETTING.lower() not in ("1", "on", "true", "yes"):
+    PREWARM_PAGES = tuple(name.strip() for name in PREWARM_SETTING.split(",") if name.strip())
+else:
+    PREWARM_PAGES = DEFAULT_PAGES
+SLICE_GAP_MS = 50 # Pause between slices so user input is handled in between
+
+class PrewarmScheduler:
+    """Builds and warms pages during idle time, one slice at a time."""
+    def __init__(self, app, pages=PREWARM_PAGES, enabled=PREWARM_ENABLED):
+        self.app = app
+        self.pages = list(pages)
+        self.enabled = enabled
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prewarm")
+        self._steps = []
+        self._after_id = None
+        self._generation = 0 # Bumped on cancel so a background import that finishes later is ignored
+        self.timings = {} # page name -> {"import": s, "build": s, "warm": s}
+        self.first_shown = {} # page name -> (seconds to show it the first time, whether it was pre-warmed)
+
+    def start(self):
+        """Queues every configured page that has not been built yet."""
+        self.cancel()
+        if not self.enabled:
+            return
+        self._steps = []
+        for page_name in self.pages:
+            if page_name not in self.app.frame_classes:
+                print(f"Prewarm: unknown page {page_name}")
+            elif page_name not in self.app.frames:
+                self._steps += [(self._import, page_name), (self._build, page_name), (self._warm, page_name)]
+        self._schedule()
+
+    def cancel(self):
+        """Stops pre-warming; pages already built are kept."""
+        self._generation += 1
+        self._steps = []
+        if self._after_id is not None:
+            self.app.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _schedule(self, delay=SLICE_GAP_MS):
+        if self._steps:
+            self._after_id = self.app.after(delay, self._idle)
+
+    def _idle(self):
+        # Wait for the event queue to drain, then run one slice
+        self._after_id = self.app.after_idle(self._run_slice)
+
+    def _run_slice(self):
+        self._after_id = None
+        if self._steps:
+            step, page_name = self._steps.pop(0)
+            step(page_name)
+
+    def _timing(self, page_name):
+        return self.timings.setdefault(page_name, {})
+
+    def _import(self, page_name):
+        """Imports the page's module on the worker thread, unless it is already loaded."""
+        if self.app.frame_classes.is_loaded(page_name):
+            self._schedule(0)
+            return
+        module_name = self.app.frame_classes.module_name(page_name)
+        started = time.perf_counter()
+        generation = self._generation
+        run_in_background(self.app, self._executor, importlib.import_module, module_name,
+                          on_done=lambda module: self._imported(page_name, started, generation),
+                          on_error=lambda e: self._imported(page_name, started, generation, e))
+
+    def _imported(self, page_name, started, generation, error=None):
+        if generation != self._generation:
+            return # Cancelled while the module was importing
+        self._timing(page_name)["import"] = time.perf_counter() - started
+        if error is not None:
+            print(f"Prewarm: could not import {page_name}: {error}")
+            self._steps = [step for step in self._steps if step[1] != page_name]
+        self._schedule()
+
+    def _build(self, page_name):
+        started = time.perf_counter()
+        self.app.create_frame(page_name)
+        self._timing(page_name)["build"] = time.perf_counter() - started
+        self._schedule()
+
+    def _warm(self, page_name):
+        frame = self.app.frames.get(page_name)
+        if frame is not None and hasattr(frame, "prewarm"):
+            started = time.perf_counter()
+            frame.prewarm()
+            self._timing(page_name)["warm"] = time.perf_counter() - started
+        self._schedule()
+
+    def record_show(self, page_name, seconds):
+        """Records how long a page took to show the first time it was opened."""
+        if page_name not in self.first_shown:
+            self.first_shown[page_name] = (seconds, "build" in self.timings.get(page_name, {}))
+
+    def stats(self):
+        """Returns one line per page with its pre-warm timings and first-show latency."""
+        lines = []
+        for page_name in dict.fromkeys(list(self.timings) + list(self.first_shown)):
+            parts = [f"{step} {seconds * 1000:.0f} ms" for step, seconds in self.timings.get(page_name, {}).items()]
+            if page_name in self.first_shown:
+                seconds, prewarmed = self.first_shown[page_name]
+                parts.append(f"first shown in {seconds * 1000:.0f} ms ({'pre-warmed' if prewarmed else 'cold'})")
+            lines.append(f"{page_name}: {', '.join(parts)}")
+        return lines
+
+    def shutdown(self):
+        """Stops pre-warming and the import thread."""
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
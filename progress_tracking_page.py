@@ -1,11 +1,105 @@
 import tkinter as tk
 from tkinter import messagebox
-import database
-import matplotlib.pyplot as plt
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from datetime import datetime # Import datetime
+from matplotlib.figure import Figure
+import numpy as np
+import chart_data
+import database
+from analysis_engine import WorkoutHistory
+from db_executor import run_in_background
 from scrolled_frame import ScrolledFrame # Import the custom ScrolledFrame
 
+MARKER_LIMIT = 200 # Draw point markers only when the chart shows this few points
+ZOOM_REFRESH_DELAY_MS = 150 # Debounce for re-sampling after zooming or panning
+RENDER_POLL_MS = 30 # How often the Tk loop checks for a finished background render
+RENDER_CACHE_SIZE = 16 # Rendered charts memoized per (user, chart, sampling, data version)
+
+class ChartSpec(NamedTuple):
+    column: str # WorkoutHistory column plotted by this chart
+    color: str
+    ylabel: str
+    title: str
+    aggregation: str # Default aggregation when resampling
+    empty_message: str
+
+CHART_SPECS = {
+    "Calories Burned": ChartSpec("calories", "red", "Calories Burned", "Calories Burned Over Time", "sum", "No exercise data available."),
+    "Sets Completed": ChartSpec("sets", "blue", "Sets", "Sets Completed Over Time", "sum", "No exercise data available."),
+    "Reps Completed": ChartSpec("reps", "green", "Repetitions", "Repetitions Completed Over Time", "sum", "No exercise data available."),
+    "Weight Lifted": ChartSpec("weight_kg", "purple", "Weight (kg)", "Weight Lifted Over Time", "max", "No weight data available."),
+}
+
+class ChartRender(NamedTuple):
+    """A chart produced by the render worker, ready to be shown on the Tk thread."""
+    generation: int
+    cache_key: tuple # (user_id, data_version, chart_name, mode, how, max_points)
+    history: WorkoutHistory
+    chart_name: str
+    dates: np.ndarray # Full-resolution series, kept for zoom re-sampling
+    values: np.ndarray
+    plot_dates: np.ndarray
+    plot_values: np.ndarray
+    sampling_text: str
+    xlim: tuple
+    ylim: tuple
+    background: np.ndarray # RGBA pixels of the static parts (axes, ticks, labels), without the line
+
+class ChartAxes(NamedTuple):
+    """The persistent artists of a progress chart figure."""
+    ax: object
+    lines: dict # Chart name -> Line2D, updated in place with set_data
+    message: object # Text shown instead of a line when there is nothing to plot
+
+def _sample(dates, values, mode, how, max_points):
+    """Applies a resampling mode and caps the points to max_points.
+    Returns (plot_dates, plot_values, description).
+    """
+    bucket = chart_data.RESAMPLE_BUCKETS.get(mode)
+    plot_dates, plot_values, bucket = chart_data.prepare_series(dates, values, max_points, bucket=bucket, how=how, auto=(mode == "Auto"))
+    bucket_names = {code: name.lower() for name, code in chart_data.RESAMPLE_BUCKETS.items()}
+    detail = f"{bucket_names[bucket]} {how}" if bucket else "raw"
+    return plot_dates, plot_values, f"Showing {len(plot_dates)} of {len(dates)} points ({detail})"
+
+def _build_chart_axes(figure):
+    """Creates the axes with one prepared Line2D per chart type. The static
+    layout is set up once, so switching charts only updates data, labels and limits.
+    """
+    ax = figure.add_subplot(111)
+    ax.xaxis_date()
+    ax.tick_params(axis="x", labelrotation=30) # Rotate x-axis labels for better readability
+    figure.subplots_adjust(bottom=0.2)
+    lines = {name: ax.plot([], [], linestyle='-', color=spec.color, visible=False)[0] for name, spec in CHART_SPECS.items()}
+    message = ax.text(0.5, 0.5, "", horizontalalignment='center', verticalalignment='center', transform=ax.transAxes, visible=False)
+    return ChartAxes(ax, lines, message)
+
+def _apply_chart(chart_axes, chart_name, plot_dates, plot_values, message=None):
+    """Shows one chart on the persistent artists and returns its line,
+    or None when a message is shown instead.
+    """
+    for line in chart_axes.lines.values():
+        line.set_visible(False)
+    if message is not None or not len(plot_dates):
+        chart_axes.message.set_text(message or CHART_SPECS[chart_name].empty_message)
+        chart_axes.message.set_visible(True)
+        chart_axes.ax.set_ylabel("")
+        chart_axes.ax.set_title("")
+        return None
+
+    spec = CHART_SPECS[chart_name]
+    chart_axes.message.set_visible(False)
+    line = chart_axes.lines[chart_name]
+    line.set_data(plot_dates, plot_values)
+    line.set_marker('o' if len(plot_dates) <= MARKER_LIMIT else None)
+    line.set_visible(True)
+    chart_axes.ax.set_ylabel(spec.ylabel)
+    chart_axes.ax.set_title(spec.title)
+    return line
+
 class ProgressTrackingFrame(tk.Frame):
     """Frame for tracking fitness progress with charts."""
     def __init__(self, parent, controller):
@@ -34,105 +128,287 @@ class ProgressTrackingFrame(tk.Frame):
         tk.Label(chart_options_frame, text="Select Chart:", bg=self.controller.config['content_bg_color'], fg=self.controller.config['text_color']).pack(side=tk.LEFT, padx=5)
         self.chart_type_var = tk.StringVar(self)
         self.chart_type_var.set("Calories Burned") # Default value
-        chart_choices = ["Calories Burned", "Sets Completed", "Reps Completed", "Weight Lifted"]
+        chart_choices = list(CHART_SPECS)
         chart_option_menu = tk.OptionMenu(chart_options_frame, self.chart_type_var, *chart_choices, command=self._update_chart)
         chart_option_menu.config(font=("Inter", 10), bg=self.controller.config['button_color'], fg="white")
         chart_option_menu.pack(side=tk.LEFT, padx=5)
 
+        # Resampling options: "Auto" picks the bucket from the visible date range
+        tk.Label(chart_options_frame, text="Resample:", bg=self.controller.config['content_bg_color'], fg=self.controller.config['text_color']).pack(side=tk.LEFT, padx=5)
+        self.resample_var = tk.StringVar(self)
+        self.resample_var.set("Auto")
+        resample_menu = tk.OptionMenu(chart_options_frame, self.resample_var, "Auto", "Raw", *chart_data.RESAMPLE_BUCKETS, command=self._update_chart)
+        resample_menu.config(font=("Inter", 10), bg=self.controller.config['button_color'], fg="white")
+        resample_menu.pack(side=tk.LEFT, padx=5)
+
+        self.aggregate_var = tk.StringVar(self)
+        self.aggregate_var.set("Auto")
+        aggregate_menu = tk.OptionMenu(chart_options_frame, self.aggregate_var, "Auto", "Sum", "Mean", "Max", command=self._update_chart)
+        aggregate_menu.config(font=("Inter", 10), bg=self.controller.config['button_color'], fg="white")
+        aggregate_menu.pack(side=tk.LEFT, padx=5)
+
+        self.sampling_label = tk.Label(chart_options_frame, text="", font=("Inter", 9), bg=self.controller.config['content_bg_color'], fg=self.controller.config['text_color'])
+        self.sampling_label.pack(side=tk.LEFT, padx=5)
+
         # Matplotlib figure and canvas
-        self.figure = plt.Figure(figsize=(7, 5), dpi=100, facecolor=self.controller.config['content_bg_color'])
-        self.ax = self.figure.add_subplot(111)
+        self.figure = Figure(figsize=(7, 5), dpi=100, facecolor=self.controller.config['content_bg_color'])
+        self._chart_axes = _build_chart_axes(self.figure)
+        self.ax = self._chart_axes.ax
+        self.ax.callbacks.connect("xlim_changed", self._on_xlim_changed)
         
         self.canvas = FigureCanvasTkAgg(self.figure, master=content_interior) # Master is now content_interior
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.pack(side=tk.TOP, fill=tk.BOTH, expand=True, pady=10)
+        # A canvas resize redraws the whole figure, so it is held back while the page is hidden
+        self._visible = False
+        self._pending_resize = None
+        self.canvas_widget.bind("<Configure>", self._on_canvas_configure) # Replaces the canvas's own binding
 
         # Toolbar for chart navigation (zoom, pan, etc.)
         self.toolbar = NavigationToolbar2Tk(self.canvas, content_interior) # Master is now content_interior
         self.toolbar.update()
+
+        # The user's history, loaded and parsed once and shared by all chart types
+        self._history = None
+        self._history_key = None # (user_id, data version) of the loaded history
+
+        # Full-resolution series of the current chart, re-sampled when the view changes
+        self._series_dates = None
+        self._series_values = None
+        self._series_line = None
+        self._zoom_refresh_id = None
+
+        # Charts are loaded and rendered off the Tk thread; each request gets a new
+        # generation number and results from older generations are discarded.
+        self._render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart-render")
+        self._render_future = None
+        self._render_generation = 0
+        self._render_cache = OrderedDict() # Memoized ChartRender results, most recent last
+        self._applying_render = False # Set while limits are restored, so zoom handling ignores it
         
         # Back to Dashboard button
         tk.Button(content_interior, text="Back to Dashboard", font=("Inter", 12), bg=self.controller.config['button_color'], fg="white",
                   command=lambda: self.controller.show_frame("DashboardFrame"), relief="raised", bd=3, cursor="hand2", padx=10, pady=5).pack(pady=10)
 
     def _update_chart(self, *args):
-        """Updates the chart based on the selected type."""
+        """Updates the chart based on the selected type, reusing the loaded history."""
+        self._request_render()
+
+    def _request_render(self):
+        """Shows the chart for the current selections: instantly from the memo when
+        possible, otherwise via a background render that cancels any render in flight.
+        The history is only reloaded when its data version has changed.
+        """
+        self._render_generation += 1
+        generation = self._render_generation
+        if self._render_future is not None:
+            self._render_future.cancel() # Only succeeds if it has not started; otherwise it is discarded later
+
         if not self.controller.current_user_id:
-            self.ax.clear()
-            self.ax.text(0.5, 0.5, "Please log in to view progress.", horizontalalignment='center', verticalalignment='center', transform=self.ax.transAxes)
+            self._set_rendering(False)
+            self._series_line = _apply_chart(self._chart_axes, None, [], [], message="Please log in to view progress.")
+            self.sampling_label.config(text="")
             self.canvas.draw()
             return
 
-        logs = database.get_exercise_logs(self.controller.current_user_id)
-        
-        # Clear existing plot
-        self.ax.clear()
+        # Tk state is read here on the main thread; the worker only gets plain values
+        user_id = self.controller.current_user_id
+        chart_name = self.chart_type_var.get()
+        mode, how = self._sampling_options(CHART_SPECS[chart_name])
+        data_version = database.get_data_version(user_id, "exercise_logs")
+        cache_key = (user_id, data_version, chart_name, mode, how, self._max_points())
+        reuse_history = self._history_key == (user_id, data_version)
+
+        cached = self._render_cache.get(cache_key) if reuse_history else None
+        if cached is not None:
+            self._render_cache.move_to_end(cache_key)
+            self._set_rendering(False)
+            self._show_render(cached)
+            return
+
+        request = {
+            "user_id": user_id,
+            "history": self._history if reuse_history else None,
+            "chart_name": chart_name,
+            "cache_key": cache_key,
+            "mode": mode,
+            "how": how,
+            "max_points": cache_key[-1],
+            "size_inches": tuple(self.figure.get_size_inches()),
+            "dpi": self.figure.dpi,
+            "facecolor": self.figure.get_facecolor(),
+        }
+        self._set_rendering(True)
+        self._render_future = run_in_background(self.controller, self._render_executor, self._render_chart, generation, request,
+                                                on_done=lambda result: self._render_done(generation, result),
+                                                on_error=lambda e: self._render_failed(generation, e),
+                                                poll_ms=RENDER_POLL_MS)
 
-        chart_type = self.chart_type_var.get()
+    def _render_chart(self, generation, request):
+        """Worker thread: loads the data, samples it and renders the static parts with Agg.
+        Returns None as soon as a newer request has superseded this one.
+        """
+        history = request["history"] or WorkoutHistory.load(request["user_id"])
+        if generation != self._render_generation:
+            return None
 
-        if not logs:
-            self.ax.text(0.5, 0.5, "No exercise data available.", horizontalalignment='center', verticalalignment='center', transform=self.ax.transAxes)
+        chart_name = request["chart_name"]
+        dates, values = history.dates, history.column(CHART_SPECS[chart_name].column)
+        plot_dates, plot_values, sampling_text = _sample(dates, values, request["mode"], request["how"], request["max_points"])
+        if generation != self._render_generation:
+            return None
+
+        # Render into an offscreen figure with the same layout so the Tk figure is never touched here
+        figure = Figure(figsize=request["size_inches"], dpi=request["dpi"], facecolor=request["facecolor"])
+        agg_canvas = FigureCanvasAgg(figure)
+        chart_axes = _build_chart_axes(figure)
+        line = _apply_chart(chart_axes, chart_name, plot_dates, plot_values)
+        chart_axes.ax.relim(visible_only=True)
+        chart_axes.ax.autoscale_view()
+        xlim, ylim = chart_axes.ax.get_xlim(), chart_axes.ax.get_ylim()
+        if line is not None:
+            line.set_visible(False) # The background holds only the static parts; the line is blitted on top
+        agg_canvas.draw()
+        if generation != self._render_generation:
+            return None
+        background = np.asarray(agg_canvas.buffer_rgba()).copy()
+        return ChartRender(generation, request["cache_key"], history, chart_name, dates, values,
+                           plot_dates, plot_values, sampling_text, xlim, ylim, background)
+
+    def _render_failed(self, generation, error):
+        if generation == self._render_generation:
+            self._set_rendering(False)
+            messagebox.showerror("Chart Error", f"Could not render the chart: {error}")
+
+    def _render_done(self, generation, result):
+        """Tk thread: shows the worker's result unless a newer request superseded it."""
+        if generation != self._render_generation:
+            return
+        self._set_rendering(False)
+        if result is None:
+            return
+
+        if result.history is not self._history:
+            # New data: renders memoized for other users or versions are stale
+            self._history = result.history
+            self._history_key = result.cache_key[:2]
+            for key in [key for key in self._render_cache if key[:2] != self._history_key]:
+                del self._render_cache[key]
+        self._render_cache[result.cache_key] = result
+        while len(self._render_cache) > RENDER_CACHE_SIZE:
+            self._render_cache.popitem(last=False)
+        self._show_render(result)
+
+    def _show_render(self, result):
+        """Updates the persistent artists in place and blits the cached background plus the line."""
+        self._series_dates = result.dates
+        self._series_values = result.values
+
+        self._applying_render = True
+        try:
+            self._series_line = _apply_chart(self._chart_axes, result.chart_name, result.plot_dates, result.plot_values)
+            self.ax.set_xlim(result.xlim)
+            self.ax.set_ylim(result.ylim)
+        finally:
+            self._applying_render = False
+        self.sampling_label.config(text=result.sampling_text if self._series_line is not None else "")
+
+        buffer = np.asarray(self.canvas.get_renderer().buffer_rgba())
+        if buffer.shape != result.background.shape:
+            self.canvas.draw() # The canvas was resized since the render started
+            return
+        buffer[:] = result.background # Restore the static parts
+        if self._series_line is not None:
+            self.ax.draw_artist(self._series_line)
+        self.canvas.blit(self.figure.bbox)
+
+    def _set_rendering(self, busy):
+        """Shows or clears the progress state while a render is running."""
+        if busy:
+            self.sampling_label.config(text="Rendering chart...")
+            self.config(cursor="watch")
         else:
-            # Ensure dates are parsed correctly
-            dates = []
-            # Make sure we handle potential parsing errors or missing data gracefully
-            for log in logs:
-                try:
-                    dates.append(datetime.strptime(log[5], "%Y-%m-%d %H:%M:%S"))
-                except (ValueError, IndexError):
-                    # Handle cases where log[5] is missing or malformed
-                    continue
-            
-            # If no valid dates, display message
-            if not dates:
-                self.ax.text(0.5, 0.5, "No valid date data in logs.", horizontalalignment='center', verticalalignment='center', transform=self.ax.transAxes)
-                self.canvas.draw()
-                return
-
-            dates.sort() # Ensure dates are sorted for chronological display
-
-            if chart_type == "Calories Burned":
-                data = [log[4] for log in logs if len(log) > 4] # calories is at index 4
-                # Align data with sorted dates for proper plotting
-                data_dict = {datetime.strptime(log[5], "%Y-%m-%d %H:%M:%S"): log[4] for log in logs if len(log) > 5 and log[4] is not None}
-                plot_data = [data_dict.get(d) for d in dates] # Get data points aligned with sorted dates
-                
-                self.ax.plot(dates, plot_data, marker='o', linestyle='-', color='red')
-                self.ax.set_ylabel("Calories Burned")
-                self.ax.set_title("Calories Burned Over Time")
-            elif chart_type == "Sets Completed":
-                data = [log[1] for log in logs if len(log) > 1] # sets is at index 1
-                data_dict = {datetime.strptime(log[5], "%Y-%m-%d %H:%M:%S"): log[1] for log in logs if len(log) > 5 and log[1] is not None}
-                plot_data = [data_dict.get(d) for d in dates]
-                
-                self.ax.plot(dates, plot_data, marker='o', linestyle='-', color='blue')
-                self.ax.set_ylabel("Sets")
-                self.ax.set_title("Sets Completed Over Time")
-            elif chart_type == "Reps Completed":
-                data = [log[2] for log in logs if len(log) > 2] # reps is at index 2
-                data_dict = {datetime.strptime(log[5], "%Y-%m-%d %H:%M:%S"): log[2] for log in logs if len(log) > 5 and log[2] is not None}
-                plot_data = [data_dict.get(d) for d in dates]
-                
-                self.ax.plot(dates, plot_data, marker='o', linestyle='-', color='green')
-                self.ax.set_ylabel("Repetitions")
-                self.ax.set_title("Repetitions Completed Over Time")
-            elif chart_type == "Weight Lifted":
-                # Filter logs to only include entries with weight
-                weighted_logs = [(datetime.strptime(log[5], "%Y-%m-%d %H:%M:%S"), log[3]) for log in logs if len(log) > 3 and log[3] is not None]
-                if weighted_logs:
-                    weighted_logs.sort(key=lambda x: x[0]) # Sort by date
-                    dates_weighted = [item[0] for item in weighted_logs]
-                    weights = [item[1] for item in weighted_logs]
-                    self.ax.plot(dates_weighted, weights, marker='o', linestyle='-', color='purple')
-                    self.ax.set_ylabel("Weight (kg)")
-                    self.ax.set_title("Weight Lifted Over Time")
-                else:
-                    self.ax.text(0.5, 0.5, "No weight data available.", horizontalalignment='center', verticalalignment='center', transform=self.ax.transAxes)
-
-        self.figure.autofmt_xdate() # Rotate x-axis labels for better readability
-        self.canvas.draw()
+            self.config(cursor="")
+
+    def _max_points(self):
+        """Number of points worth plotting: one per horizontal pixel of the canvas."""
+        width = self.canvas_widget.winfo_width()
+        if width <= 1: # Not laid out yet
+            width = int(self.figure.get_figwidth() * self.figure.dpi)
+        return max(width, 10)
+
+    def _sampling_options(self, spec):
+        """Reads the resample mode and aggregation from the menus."""
+        how = self.aggregate_var.get().lower()
+        if how == "auto":
+            how = spec.aggregation
+        return self.resample_var.get(), how
+
+    def _on_xlim_changed(self, ax):
+        """Schedules a re-sample of the visible range after a zoom or pan."""
+        if self._applying_render:
+            return
+        if self._zoom_refresh_id:
+            self.after_cancel(self._zoom_refresh_id)
+        self._zoom_refresh_id = self.after(ZOOM_REFRESH_DELAY_MS, self._refresh_visible_range)
+
+    def _refresh_visible_range(self):
+        """Re-samples the series for the visible date range and updates the line in place."""
+        self._zoom_refresh_id = None
+        if self._series_line is None or self._series_dates is None or not len(self._series_dates):
+            return
+        xmin, xmax = self.ax.get_xlim()
+        start = np.datetime64(mdates.num2date(xmin).replace(tzinfo=None), "s")
+        end = np.datetime64(mdates.num2date(xmax).replace(tzinfo=None), "s")
+        # Keep one point beyond each edge so the line runs off the visible area
+        first = max(np.searchsorted(self._series_dates, start) - 1, 0)
+        last = np.searchsorted(self._series_dates, end, side="right") + 1
+        mode, how = self._sampling_options(CHART_SPECS[self.chart_type_var.get()])
+        plot_dates, plot_values, sampling_text = _sample(self._series_dates[first:last], self._series_values[first:last], mode, how, self._max_points())
+        self.sampling_label.config(text=sampling_text)
+        self._series_line.set_data(plot_dates, plot_values)
+        self._series_line.set_marker('o' if len(plot_dates) <= MARKER_LIMIT else None)
+        self.canvas.draw_idle()
+
+    def _on_canvas_configure(self, event):
+        if self._visible:
+            self.canvas.resize(event)
+        else:
+            self._pending_resize = event # Only the latest size matters
+
+    def memory_bytes(self):
+        """Pixels held for the chart: the Agg buffer and the Tk image it is blitted to."""
+        width, height = self.canvas.get_width_height()
+        return width * height * 4 * 2
+
+    def destroy(self):
+        """Stops the render worker and releases the figure before the page is destroyed."""
+        self._render_generation += 1 # Pending polls and results are ignored
+        if self._zoom_refresh_id:
+            self.after_cancel(self._zoom_refresh_id)
+            self._zoom_refresh_id = None
+        self._render_executor.shutdown(wait=False, cancel_futures=True)
+        self._render_cache.clear()
+        self.figure.clear()
+        super().destroy()
+
+    def prewarm(self):
+        """Renders the current chart in the background before the page is first shown."""
+        self._request_render()
+
+    def on_hide(self):
+        """Method called when another frame is shown in place of this one."""
+        self._visible = False
+        if self._zoom_refresh_id:
+            self.after_cancel(self._zoom_refresh_id)
+            self._zoom_refresh_id = None
 
     def on_show(self):
         """Method called when this frame is shown."""
-        # Ensure chart is updated when the frame becomes visible
-        self._update_chart()
+        self._visible = True
+        if self._pending_resize is not None:
+            # One catch-up resize for the size changes missed while hidden
+            event, self._pending_resize = self._pending_resize, None
+            self.canvas.resize(event)
+        # Reloads the history only if exercises were logged while the page was hidden
+        self._request_render()
@@ -0,0 +1,140 @@
+import sys
+
+# Materialized per-user and per-exercise aggregates of exercise_logs.
+# The rollup tables are kept up to date incrementally inside the same
+# transaction that inserts the logs, so the Data Analysis page can read its
+# statistics in O(number of exercises) instead of scanning the whole history.
+# Every function here works on a connection supplied by the caller and never
+# commits; that is left to the surrounding transaction.
+
+_UPSERT_USER = '''
+    INSERT INTO user_rollups (user_id, workout_count, total_sets, total_reps, total_calories, first_log_date, last_log_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (user_id) DO UPDATE SET
+        workout_count = workout_count + excluded.workout_count,
+        total_sets = total_sets + excluded.total_sets,
+        total_reps = total_reps + excluded.total_reps,
+        total_calories = total_calories + excluded.total_calories,
+        first_log_date = MIN(first_log_date, excluded.first_log_date),
+        last_log_date = MAX(last_log_date, excluded.last_log_date)
+'''
+
+_UPSERT_EXERCISE = '''
+    INSERT INTO exercise_rollups (user_id, exercise_name, workout_count, total_sets, total_reps, total_calories, max_weight_kg, first_log_date, last_log_date)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (user_id, exercise_name) DO UPDATE SET
+        workout_count = workout_count + excluded.workout_count,
+        total_sets = total_sets + excluded.total_sets,
+        total_reps = total_reps + excluded.total_reps,
+        total_calories = total_calories + excluded.total_calories,
+        max_weight_kg = MAX(COALESCE(max_weight_kg, excluded.max_weight_kg), COALESCE(excluded.max_weight_kg, max_weight_kg)),
+        first_log_date = MIN(first_log_date, excluded.first_log_date),
+        last_log_date = MAX(last_log_date, excluded.last_log_date)
+'''
+
+def create_tables(conn):
+    """Creates the user_rollups and exercise_rollups tables."""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS user_rollups (
+            user_id INTEGER PRIMARY KEY,
+            workout_count INTEGER NOT NULL,
+            total_sets INTEGER NOT NULL,
+            total_reps INTEGER NOT NULL,
+            total_calories INTEGER NOT NULL,
+            first_log_date TEXT NOT NULL,
+            last_log_date TEXT NOT NULL,
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS exercise_rollups (
+            user_id INTEGER NOT NULL,
+            exercise_name TEXT NOT NULL,
+            workout_count INTEGER NOT NULL,
+            total_sets INTEGER NOT NULL,
+            total_reps INTEGER NOT NULL,
+            total_calories INTEGER NOT NULL,
+            max_weight_kg REAL, -- NULL until a weighted set is logged
+            first_log_date TEXT NOT NULL,
+            last_log_date TEXT NOT NULL,
+            PRIMARY KEY (user_id, exercise_name),
+            FOREIGN KEY (user_id) REFERENCES users (id)
+        )
+    ''')
+
+def apply_logs(conn, user_id, logs):
+    """Adds newly inserted logs to the rollups.
+    logs is a list of (exercise_name, sets, reps, weight_kg, calories, log_date)
+    tuples; they are combined per exercise first so a bulk insert costs one
+    upsert per distinct exercise.
+    """
+    if not logs:
+        return
+    per_exercise = {}
+    for exercise_name, sets, reps, weight_kg, calories, log_date in logs:
+        totals = per_exercise.get(exercise_name)
+        if totals is None:
+            per_exercise[exercise_name] = [1, sets, reps, calories, weight_kg, log_date, log_date]
+            continue
+        totals[0] += 1
+        totals[1] += sets
+        totals[2] += reps
+        totals[3] += calories
+        if weight_kg is not None and (totals[4] is None or weight_kg > totals[4]):
+            totals[4] = weight_kg
+        totals[5] = min(totals[5], log_date)
+        totals[6] = max(totals[6], log_date)
+
+    conn.executemany(_UPSERT_EXERCISE, [(user_id, name) + tuple(totals) for name, totals in per_exercise.items()])
+    conn.execute(_UPSERT_USER, (
+        user_id,
+        sum(totals[0] for totals in per_exercise.values()),
+        sum(totals[1] for totals in per_exercise.values()),
+        sum(totals[2] for totals in per_exercise.values()),
+        sum(totals[3] for totals in per_exercise.values()),
+        min(totals[5] for totals in per_exercise.values()),
+        max(totals[6] for totals in per_exercise.values()),
+    ))
+
+def rebuild(conn, user_id=None):
+    """Recomputes the rollups from exercise_logs, for one user or for everyone."""
+    where, params = ("WHERE user_id = ?", (user_id,)) if user_id is not None else ("", ())
+    conn.execute(f"DELETE FROM exercise_rollups {where}", params)
+    conn.execute(f"DELETE FROM user_rollups {where}", params)
+    conn.execute(f'''
+        INSERT INTO exercise_rollups (user_id, exercise_name, workout_count, total_sets, total_reps, total_calories, max_weight_kg, first_log_date, last_log_date)
+        SELECT user_id, exercise_name, COUNT(*), SUM(sets), SUM(reps), SUM(calories), MAX(weight_kg), MIN(log_date), MAX(log_date)
+        FROM exercise_logs {where}
+        GROUP BY user_id, exercise_name
+    ''', params)
+    conn.execute(f'''
+        INSERT INTO user_rollups (user_id, workout_count, total_sets, total_reps, total_calories, first_log_date, last_log_date)
+        SELECT user_id, SUM(workout_count), SUM(total_sets), SUM(total_reps), SUM(total_calories), MIN(first_log_date), MAX(last_log_date)
+        FROM exercise_rollups {where}
+        GROUP BY user_id
+    ''', params)
+
+def get_user_rollup(conn, user_id):
+    """Returns (workout_count, total_sets, total_reps, total_calories, first_log_date, last_log_date) or None."""
+    return conn.execute(
+        "SELECT workout_count, total_sets, total_reps, total_calories, first_log_date, last_log_date FROM user_rollups WHERE user_id = ?",
+        (user_id,)
+    ).fetchone()
+
+def get_exercise_rollups(conn, user_id):
+    """Returns per-exercise (exercise_name, workout_count, total_sets, total_reps,
+    total_calories, max_weight_kg, first_log_date, last_log_date) rows, most frequent first.
+    """
+    return conn.execute(
+        "SELECT exercise_name, workout_count, total_sets, total_reps, total_calories, max_weight_kg, first_log_date, last_log_date "
+        "FROM exercise_rollups WHERE user_id = ? ORDER BY workout_count DESC, exercise_name ASC",
+        (user_id,)
+    ).fetchall()
+
+if __name__ == "__main__":
+    # Rebuild command: python rollups.py [user_id]
+    import database
+    database.create_tables()
+    target_user = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    database.rebuild_rollups(target_user)
+    print(f"Rebuilt rollups for {'user ' + str(target_user) if target_user is not None else 'all users'}.")
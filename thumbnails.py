@@ -0,0 +1,172 @@
+import hashlib
+import json
+import math
+import os
+import sys
+import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageTk
+from PIL.PngImagePlugin import PngInfo
+
+import utils
+from db_executor import run_in_background
+
+# Thumbnail pipeline for the exercise tiles.
+# Icons are multi-megapixel photos, but a tile shows them at TILE_SIZE. Each
+# thumbnail is generated once with JPEG DCT scaling (Image.draft decodes at
+# 1/2, 1/4 or 1/8 scale directly, so the full image is never decoded) and
+# stored on disk, keyed by the icon's content hash and the tile size. All the
+# thumbnails of a catalog are then packed into one atlas PNG, so painting the
+# tiles costs one file read and one PhotoImage no matter how many exercises
+# there are; each tile is cut out of the atlas inside Tk. Work happens on a
+# background thread and the atlas can be pregenerated at startup or with
+# `python thumbnails.py [icon ...]`.
+
+TILE_SIZE = (150, 150) # Size of the image on an exercise tile
+THUMBNAIL_DIR = ".thumbnail_cache" # Relative to the working directory, like the database file
+THUMBNAIL_VERSION = 1 # Bump when the thumbnail or atlas format changes
+
+def _cache_file(cache_dir, name, size):
+    return os.path.join(cache_dir, f"{name}_{size[0]}x{size[1]}_v{THUMBNAIL_VERSION}.png")
+
+def make_thumbnail(path, size):
+    """Decodes an image at the smallest scale that still covers size and resizes it to size."""
+    with Image.open(path) as image:
+        image.draft("RGB", size) # JPEG only: lets the decoder skip most of the pixels
+        return image.convert("RGB").resize(size, Image.Resampling.LANCZOS)
+
+def get_thumbnail(path, size, cache_dir=THUMBNAIL_DIR, digest=None):
+    """Returns the thumbnail of path from the disk cache, generating it if needed."""
+    cache_path = _cache_file(cache_dir, (digest or utils.file_digest(path))[:32], size)
+    if os.path.exists(cache_path):
+        try:
+            with Image.open(cache_path) as cached:
+                return cached.convert("RGB")
+        except OSError as e:
+            print(f"Ignoring unreadable thumbnail {cache_path}: {e}")
+    thumbnail = make_thumbnail(path, size)
+    _save(thumbnail, cache_path)
+    return thumbnail
+
+def _save(image, path, pnginfo=None):
+    """Writes a PNG through a temporary file; a failed write only costs the cache entry."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        image.save(temp_path, format="PNG", pnginfo=pnginfo)
+        os.replace(temp_path, path)
+    except OSError as e:
+        print(f"Could not write thumbnail cache {path}: {e}")
+
+def build_atlas(paths, size=TILE_SIZE, cache_dir=THUMBNAIL_DIR, digest=utils.file_digest):
+    """Packs the thumbnails of paths into one image.
+    Returns (atlas, boxes, errors): boxes maps each path to its (left, top,
+    right, bottom) box in the atlas and errors maps paths that could not be
+    loaded to the exception. atlas is None if no thumbnail could be made.
+    """
+    digests, errors = {}, {}
+    for path in dict.fromkeys(paths): # Unique, in order
+        try:
+            digests[path] = digest(path)
+        except OSError as e:
+            errors[path] = e
+
+    # The atlas is keyed by the contents of every icon, so a new or changed icon rebuilds it
+    atlas_key = hashlib.sha256("".join(digests.values()).encode()).hexdigest()[:32]
+    atlas_path = _cache_file(cache_dir, f"atlas_{atlas_key}", size)
+    if digests and os.path.exists(atlas_path):
+        try:
+            with Image.open(atlas_path) as cached:
+                cached.load()
+                layout = json.loads(cached.text["layout"])
+                atlas = cached.convert("RGB")
+            return atlas, _boxes(list(digests), layout["columns"], size), errors
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Ignoring unreadable thumbnail atlas {atlas_path}: {e}")
+
+    thumbnails = {}
+    for path, content_digest in digests.items():
+        try:
+            thumbnails[path] = get_thumbnail(path, size, cache_dir, content_digest)
+        except Exception as e:
+            errors[path] = e
+    if not thumbnails:
+        return None, {}, errors
+
+    columns = math.ceil(math.sqrt(len(thumbnails)))
+    boxes = _boxes(list(thumbnails), columns, size)
+    atlas = Image.new("RGB", (columns * size[0], math.ceil(len(thumbnails) / columns) * size[1]))
+    for path, thumbnail in thumbnails.items():
+        atlas.paste(thumbnail, boxes[path][:2])
+    if not errors:
+        # Only complete atlases are cached, so a missing icon is retried next time
+        info = PngInfo()
+        info.add_text("layout", json.dumps({"columns": columns}))
+        _save(atlas, atlas_path, info)
+    return atlas, boxes, errors
+
+def _boxes(paths, columns, size):
+    width, height = size
+    return {path: ((index % columns) * width, (index // columns) * height,
+                   (index % columns + 1) * width, (index // columns + 1) * height)
+            for index, path in enumerate(paths)}
+
+class ThumbnailPipeline:
+    """Builds thumbnail atlases in the background and hands out per-tile PhotoImages."""
+    def __init__(self, root, assets, cache_dir=THUMBNAIL_DIR):
+        self.root = root
+        self.assets = assets
+        self.cache_dir = cache_dir
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="thumbnails")
+        self._tiles = {} # (paths, size) -> ({path: PhotoImage}, errors)
+
+    def cached(self, paths, size=TILE_SIZE):
+        """Returns (tiles, errors) if this catalog's tiles are already in memory, else None."""
+        return self._tiles.get((tuple(paths), tuple(size)))
+
+    def pregenerate(self, paths, size=TILE_SIZE):
+        """Builds the thumbnails and atlas on disk ahead of time. Returns the Future."""
+        return self._executor.submit(build_atlas, list(paths), tuple(size), self.cache_dir, self.assets.digest)
+
+    def load(self, paths, on_ready, size=TILE_SIZE):
+        """Calls on_ready(tiles, errors) on the Tk thread, where tiles maps each
+        path to a PhotoImage and errors maps paths that failed to their exception.
+        """
+        key = (tuple(paths), tuple(size))
+        return run_in_background(self.root, self._executor, build_atlas, list(paths), tuple(size), self.cache_dir,
+                                 self.assets.digest, on_done=lambda result: self._atlas_ready(key, *result, on_ready),
+                                 on_error=lambda e: on_ready({}, {path: e for path in key[0]}))
+
+    def _atlas_ready(self, key, atlas, boxes, errors, on_ready):
+        """Tk thread: cuts the tiles out of the atlas."""
+        tiles = {}
+        if atlas is not None:
+            # One PIL -> Tk conversion for the whole catalog; the tiles are copied out
+            # of it inside Tk and hold their own pixels, so the atlas can then be dropped
+            atlas_photo = ImageTk.PhotoImage(atlas)
+            for path, box in boxes.items():
+                tile = tk.PhotoImage(master=self.root, width=box[2] - box[0], height=box[3] - box[1])
+                tile.tk.call(tile, "copy", str(atlas_photo), "-from", *box, "-to", 0, 0)
+                tiles[path] = tile
+        self._tiles[key] = (tiles, errors)
+        on_ready(tiles, errors)
+
+    def cached_images(self):
+        """Returns the tile PhotoImages held for every loaded catalog."""
+        return [tile for tiles, errors in self._tiles.values() for tile in tiles.values()]
+
+    def memory_bytes(self):
+        """Returns the Tk memory of the tiles, in bytes (32-bit pixels)."""
+        return sum(tile.width() * tile.height() * 4 for tile in self.cached_images())
+
+    def shutdown(self):
+        """Stops the background thread."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+if __name__ == "__main__":
+    # Pregeneration command: python thumbnails.py [icon ...] (defaults to every *_icon.* file here)
+    icons = sys.argv[1:] or sorted(name for name in os.listdir(".") if os.path.splitext(name)[0].endswith("_icon"))
+    atlas, boxes, errors = build_atlas(icons)
+    for path, error in errors.items():
+        print(f"Skipped {path}: {error}")
+    print(f"Thumbnail atlas ready for {len(boxes)} icon(s) in {THUMBNAIL_DIR}/")
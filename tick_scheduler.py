@@ -0,0 +1,122 @@
+import sys
+
+# Central scheduler for periodic page work on the Tk event loop.
+# Each job has at most one outstanding after() handle and only runs while its
+# page is shown.
+
+class TickJob:
+    """A callback run repeatedly on the Tk loop on behalf of a page.
+    The callback may return the delay in ms until its next run; if it returns
+    None the job's interval is used, and a job without an interval stops.
+    """
+    def __init__(self, scheduler, owner, callback, interval_ms=None, name=None):
+        self.scheduler = scheduler
+        self.owner = owner
+        self.callback = callback
+        self.interval_ms = interval_ms
+        self.name = name or getattr(callback, "__name__", "job")
+        self.active = False # Started and not stopped; may still be paused
+        self.handle = None # The one outstanding after() id, if any
+        self.runs = 0
+
+    def start(self, delay_ms=0):
+        """Runs the job after delay_ms (or as soon as its page is shown), replacing any pending run."""
+        self.active = True
+        if self.scheduler.is_visible(self.owner):
+            self._arm(delay_ms)
+        else:
+            self._disarm()
+
+    def stop(self):
+        """Cancels the pending run; the job stays registered and can be started again."""
+        self.active = False
+        self._disarm()
+
+    def paused(self):
+        return self.active and self.handle is None
+
+    def _arm(self, delay_ms):
+        self._disarm()
+        self.handle = self.scheduler.root.after(max(int(delay_ms), 0), self._run)
+
+    def _disarm(self):
+        if self.handle is not None:
+            self.scheduler.root.after_cancel(self.handle)
+            self.handle = None
+
+    def _run(self):
+        self.handle = None
+        if not self.owner.winfo_exists():
+            self.scheduler.remove(self) # The page was destroyed
+            return
+        self.runs += 1
+        self.scheduler.ticks += 1
+        try:
+            delay_ms = self.callback()
+        except Exception:
+            self.active = False # A failing job is not retried every tick
+            self.scheduler.root.report_callback_exception(*sys.exc_info())
+            return
+        # The callback may have stopped or restarted the job itself
+        if self.active and self.handle is None:
+            delay_ms = self.interval_ms if delay_ms is None else delay_ms
+            if delay_ms is None:
+                self.active = False
+            elif self.scheduler.is_visible(self.owner):
+                self._arm(delay_ms)
+
+class TickScheduler:
+    """Owns every periodic job and pauses those whose page is not on screen."""
+    def __init__(self, root):
+        self.root = root
+        self._jobs = []
+        self._visible = None # The page currently shown
+        self.ticks = 0
+
+    def add(self, owner, callback, interval_ms=None, name=None):
+        """Registers a job for the page owner without starting it. Returns the TickJob."""
+        job = TickJob(self, owner, callback, interval_ms, name)
+        self._jobs.append(job)
+        return job
+
+    def every(self, owner, interval_ms, callback, name=None):
+        """Registers and starts a job that runs every interval_ms while owner is shown."""
+        job = self.add(owner, callback, interval_ms, name)
+        job.start()
+        return job
+
+    def remove(self, job):
+        job.stop()
+        if job in self._jobs:
+            self._jobs.remove(job)
+
+    def forget(self, owner):
+        """Removes every job of a page that is being destroyed."""
+        for job in [job for job in self._jobs if job.owner is owner]:
+            self.remove(job)
+
+    def is_visible(self, owner):
+        return owner is self._visible
+
+    def show(self, page):
+        """Called when page is raised: pauses other pages' jobs and resumes page's jobs at once."""
+        self._visible = page
+        for job in list(self._jobs):
+            if job.owner is not page:
+                job._disarm()
+            elif job.active and job.handle is None:
+                job._arm(0)
+
+    def live_timers(self):
+        """Returns the number of outstanding after() handles held by jobs."""
+        return sum(1 for job in self._jobs if job.handle is not None)
+
+    def stats(self):
+        """Returns job counts, live timers and the total number of runs."""
+        return {"jobs": len(self._jobs), "live": self.live_timers(),
+                "paused": sum(1 for job in self._jobs if job.paused()), "ticks": self.ticks}
+
+    def shutdown(self):
+        """Cancels every pending run."""
+        for job in self._jobs:
+            job._disarm()
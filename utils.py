@@ -10,3 +10,46 @@ def hash_password(password):
 def check_password(hashed_password, user_password):
     """Checks if a user-provided password matches the hashed password."""
     return hashed_password == hashlib.sha256(user_password.encode()).hexdigest()
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """Returns the SHA256 hex digest of a file's contents, read in chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _to_int(value):
+    """Converts user input to an int, rejecting fractional numbers."""
+    if isinstance(value, float):
+        if not value.is_integer():
+            raise ValueError(value)
+        return int(value)
+    return int(value)
+
+def validate_exercise_entry(exercise_name, sets, reps, weight_kg, calories):
+    """Validates an exercise log entry the way the tracker form does.
+    Accepts strings (form/CSV input) or numbers and returns the normalized
+    (exercise_name, sets, reps, weight_kg, calories) tuple.
+    Raises ValueError with a user-facing message if the entry is invalid.
+    """
+    exercise_name = str(exercise_name).strip() if exercise_name is not None else ""
+    if not exercise_name:
+        raise ValueError("Please enter an exercise name.")
+
+    if isinstance(weight_kg, str):
+        weight_kg = weight_kg.strip()
+    try:
+        sets = _to_int(sets.strip() if isinstance(sets, str) else sets)
+        reps = _to_int(reps.strip() if isinstance(reps, str) else reps)
+        calories = _to_int(calories.strip() if isinstance(calories, str) else calories)
+        weight_kg = float(weight_kg) if weight_kg not in (None, "") else None # None if empty
+    except (TypeError, ValueError):
+        raise ValueError("Please enter valid numbers for Sets, Repetitions, Weight, and Calories.")
+
+    if sets <= 0 or reps <= 0 or calories <= 0:
+        raise ValueError("Sets, Repetitions, and Calories must be positive integers.")
+    if weight_kg is not None and weight_kg <= 0:
+        raise ValueError("Weight must be a positive number or left empty.")
+
+    return exercise_name, sets, reps, weight_kg, calories